@@ -1,10 +1,62 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
 from .models import CustomUser, JobPosting, Applications
+from .pagination import estimate_count
+from .search import search_jobs, search_users
+
+
+# Below this many rows the planner estimate is replaced by an exact count
+EXACT_COUNT_THRESHOLD = 10000
+
+# Most users, and most jobs, an admin search on applications expands to
+ADMIN_USER_SEARCH_LIMIT = 200
+ADMIN_JOB_SEARCH_LIMIT = 200
+
+
+class EstimatedCountPaginator(Paginator):
+    # Changelists on big tables page with the planner's row estimate instead
+    # of COUNT(*) (exact on SQLite, and for small results everywhere)
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        # elsewhere estimate_count already is the exact count
+        if estimate < EXACT_COUNT_THRESHOLD and connections[self.object_list.db].vendor == 'postgresql':
+            return self.object_list.count()
+        return estimate
+
+
+class ScalableAdminMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # skips the second, unfiltered COUNT(*)
+    list_per_page = 50
+
+
+class CompanyListFilter(admin.SimpleListFilter):
+    # Index-backed company filter. Offers only the first companies off the
+    # job_company index instead of a DISTINCT over every posting.
+    title = 'company'
+    parameter_name = 'job_company'
+    max_choices = 50
+
+    def lookups(self, request, model_admin):
+        companies = list(JobPosting.objects.order_by('job_company')
+                         .values_list('job_company', flat=True).distinct()[:self.max_choices])
+        if self.value() and self.value() not in companies:
+            companies.append(self.value())
+        return [(company, company) for company in companies]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(job_company=self.value())
+        return queryset
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(ScalableAdminMixin, UserAdmin):
     model = CustomUser
 
     list_display = (
@@ -50,34 +102,59 @@ class CustomUserAdmin(UserAdmin):
     def has_delete_permission(self, request, obj=None):
         return True  # ✅ allow delete
 
+    def get_search_results(self, request, queryset, search_term):
+        # same trigram search as the API (also backs the autocomplete widgets)
+        if not search_term.strip():
+            return queryset, False
+        matches = search_users(CustomUser.objects.all(), search_term, ADMIN_USER_SEARCH_LIMIT)
+        return queryset.filter(pk__in=[user.pk for user in matches]), False
+
 
 @admin.register(JobPosting)
-class JobPostingAdmin(admin.ModelAdmin):
+class JobPostingAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = (
         'job_title', 'job_company', 'job_location',
         'job_setup', 'job_type', 'min_salary', 'max_salary',
         'created_at', 'author'
     )
     list_filter = (
-        'job_type', 'job_setup', 'job_company',
+        'job_type', 'job_setup', CompanyListFilter,
         ('created_at', admin.DateFieldListFilter),  
     )
+    list_select_related = ('author',)
+    autocomplete_fields = ('author',)
     search_fields = ('job_title', 'job_company', 'job_location')
-    ordering = ('-created_at',)
+    ordering = ('-created_at', '-id')
 
     def has_delete_permission(self, request, obj=None):
         return True  
 
+    def get_search_results(self, request, queryset, search_term):
+        # full-text index instead of icontains over each search field
+        return search_jobs(queryset, search_term), False
+
 
 @admin.register(Applications)
-class ApplicationsAdmin(admin.ModelAdmin):
+class ApplicationsAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ('user', 'job', 'application_status', 'date')
     list_filter = (
         'application_status',
         ('date', admin.DateFieldListFilter),  # ✅ Filter by date applied
     )
+    list_select_related = ('user', 'job')
+    autocomplete_fields = ('user', 'job')
     search_fields = ('user__username', 'user__email', 'job__job_title')
-    ordering = ('-date',)
+    ordering = ('-date', '-id')
+
+    def get_search_results(self, request, queryset, search_term):
+        # applicants by trigram user search or jobs by full-text search, both
+        # indexed, instead of icontains across the joined tables
+        if not search_term.strip():
+            return queryset, False
+        users = search_users(CustomUser.objects.all(), search_term, ADMIN_USER_SEARCH_LIMIT)
+        jobs = search_jobs(JobPosting.objects.all(), search_term).values_list('pk', flat=True)
+        job_ids = list(jobs[:ADMIN_JOB_SEARCH_LIMIT])
+        return queryset.filter(Q(user__in=[user.pk for user in users]) | Q(job__in=job_ids)), False
 
 
 admin.site.site_header = "JobFinder Admin"
@@ -0,0 +1,78 @@
+import datetime
+from collections import Counter
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from . import stats
+from .models import Applications, JobPosting
+
+
+# Applying to jobs. The duplicate check, the own-posting check and the insert
+# are a single INSERT ... SELECT ... ON CONFLICT DO NOTHING (same syntax on
+# PostgreSQL and SQLite): a job that doesn't exist or is the applicant's own
+# selects no row, an existing application makes the insert a no-op, and
+# RETURNING hands back what was created. Two concurrent submits of the same
+# (user, job) can't both insert, and neither gets an IntegrityError.
+
+INITIAL_STATUS = 'Under Review'
+
+APPLIED = 'applied'
+DUPLICATE = 'duplicate'
+OWN_JOB = 'own_job'
+NOT_FOUND = 'not_found'
+
+
+def insert(user, job_ids, using):
+    # today, {job_id: (application_id, job_title)} of the applications created
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    applications = quote(Applications._meta.db_table)
+    jobs = quote(JobPosting._meta.db_table)
+    today = datetime.date.today()  # what auto_now_add would store
+    date = Applications._meta.get_field('date').get_db_prep_value(today, connection)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {applications} (user_id, job_id, application_status, date) "
+            f"SELECT %s, job.id, %s, %s FROM {jobs} job "
+            f"WHERE job.id IN ({', '.join(['%s'] * len(job_ids))}) AND job.author_id <> %s "
+            f"ON CONFLICT (user_id, job_id) DO NOTHING "
+            f"RETURNING id, job_id, (SELECT job_title FROM {jobs} WHERE id = {applications}.job_id)",
+            [user.pk, INITIAL_STATUS, date, *job_ids, user.pk],
+        )
+        return today, {job_id: (pk, title) for pk, job_id, title in cursor.fetchall()}
+
+
+def submit(user, job_ids, using=DEFAULT_DB_ALIAS):
+    """
+    Apply `user` to every job in `job_ids`. Returns ({job_id: result}, created):
+    result is APPLIED, DUPLICATE, OWN_JOB or NOT_FOUND, and created holds the
+    new Applications with their job's title, ready to serialize without queries.
+    """
+    job_ids = list(dict.fromkeys(job_ids))
+    with transaction.atomic(using=using):
+        today, inserted = insert(user, job_ids, using)
+        # no post_save for raw inserts, so move the pipeline counters here
+        stats.apply(using, Counter({(job_id, INITIAL_STATUS): 1 for job_id in inserted}),
+                    Counter({(job_id, today): 1 for job_id in inserted}))
+
+    results = dict.fromkeys(inserted, APPLIED)
+    rejected = [job_id for job_id in job_ids if job_id not in inserted]
+    if rejected:
+        # only failures pay for finding out why
+        authors = dict(JobPosting.objects.using(using).filter(pk__in=rejected).values_list('pk', 'author_id'))
+        for job_id in rejected:
+            if job_id not in authors:
+                results[job_id] = NOT_FOUND
+            elif authors[job_id] == user.pk:
+                results[job_id] = OWN_JOB
+            else:
+                results[job_id] = DUPLICATE
+
+    created = []
+    for job_id, (pk, title) in inserted.items():
+        application = Applications(pk=pk, user=user, job=JobPosting(pk=job_id, job_title=title),
+                                   application_status=INITIAL_STATUS, date=today)
+        application._state.adding, application._state.db = False, using
+        application._loaded_status = INITIAL_STATUS
+        created.append(application)
+    return {job_id: results[job_id] for job_id in job_ids}, created
@@ -0,0 +1,131 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound, Throttled
+
+from .authentication import CachedJWTAuthentication
+from .filters import filter_jobs
+from .models import Applications, JobPosting
+from .pagination import ApplicationKeysetPagination, KeysetPagination
+from .renderers import FastJSONRenderer
+from .search import parse_terms, search_jobs
+from .serializers import (ApplicationSerializer, ApplicationWithJobSerializer, JobCardProjection,
+                          JobSearchSerializer, JobSerializer)
+from .throttling import SlidingWindowThrottle
+
+
+# Async variants of the hot read endpoints, served under /api/async/ and
+# meant for an ASGI deployment (see backend/README.md). They return the same
+# JSON as their DRF counterparts but await the database through Django's
+# async ORM, so a slow query parks a coroutine instead of a whole worker.
+# Writes, the response cache and the browsable API stay on the sync views.
+
+
+class AsyncAPIView(View):
+    """
+    The small part of DRF's APIView these endpoints need: JWT authentication,
+    throttling by `throttle_scope`, APIException -> JSON error responses and
+    FastJSONRenderer output. Subclasses implement `async def get_data(request, **kwargs)`.
+    """
+    http_method_names = ['get', 'options']
+    authentication = CachedJWTAuthentication()
+    requires_auth = False
+    throttle_scope = None
+    renderer = FastJSONRenderer()
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            await self.authenticate(request)
+            await self.check_throttle(request)
+            data = await self.get_data(request, **kwargs)
+        except APIException as exc:
+            return self.error(exc)
+        return self.render(data)
+
+    async def authenticate(self, request):
+        result = await self.authentication.aauthenticate(request)  # bad tokens raise InvalidToken (401)
+        request.user, request.auth = result if result else (None, None)
+        if self.requires_auth and request.user is None:
+            raise NotAuthenticated()
+
+    async def check_throttle(self, request):
+        if self.throttle_scope is None:
+            return
+        throttle = SlidingWindowThrottle()
+        if not await sync_to_async(throttle.allow_request)(request, self):
+            raise Throttled(throttle.wait())
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(self.renderer.render(data), status=status_code, content_type='application/json')
+
+    def error(self, exc):
+        detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(detail, exc.status_code)
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            response['WWW-Authenticate'] = self.authentication.authenticate_header(None)
+        if getattr(exc, 'wait', None):
+            response['Retry-After'] = '%d' % exc.wait
+        return response
+
+
+class AsyncJobCardListView(AsyncAPIView):
+    serializer_class = JobSerializer
+    pagination_class = KeysetPagination
+
+    def get_queryset(self, request):
+        return filter_jobs(JobPosting.objects.order_by('-created_at', '-id'), request.GET)
+
+    async def get_data(self, request, **kwargs):
+        projection = JobCardProjection.for_request(request, self.serializer_class)
+        queryset = self.get_queryset(request)
+        paginator = self.pagination_class()
+        cursor_fields = [field.lstrip('-') for field in paginator.get_ordering(request, queryset, self)]
+        page = await paginator.apaginate_queryset(projection.values(queryset, extra=cursor_fields), request, self)
+        return paginator.get_paginated_data(projection.to_representation(page))
+
+
+# Async JobPostingListCreate (GET)
+class AsyncJobPostingList(AsyncJobCardListView):
+    requires_auth = True
+
+
+# Async SearchJobPostingView
+class AsyncJobSearch(AsyncJobCardListView):
+    serializer_class = JobSearchSerializer
+    throttle_scope = 'job_search'
+
+    def get_queryset(self, request):
+        return search_jobs(JobPosting.objects.order_by('-created_at', '-id'), request.GET.get('q', ''))
+
+    def get_cursor_ordering(self):
+        if parse_terms(self.request.GET.get('q', '')):
+            return ('-search_rank', '-created_at', '-id')
+        return KeysetPagination.ordering
+
+
+# Async JobPostingDetail
+class AsyncJobPostingDetail(AsyncAPIView):
+    async def get_data(self, request, pk):
+        projection = JobCardProjection.for_request(request, JobSerializer)
+        row = await projection.values(JobPosting.objects.filter(pk=pk)).afirst()
+        if row is None:
+            raise NotFound(f'No {JobPosting._meta.object_name} matches the given query.')  # as get_object_or_404
+        return projection.to_representation([row])[0]
+
+
+# Async ApplicationCreateandView (GET)
+class AsyncApplicationList(AsyncAPIView):
+    requires_auth = True
+
+    async def get_data(self, request, **kwargs):
+        queryset = Applications.objects.select_related('job', 'user').filter(user=request.user)
+        serializer_class = ApplicationSerializer
+        if 'job' in request.GET.get('expand', '').split(','):
+            serializer_class = ApplicationWithJobSerializer
+            queryset = queryset.select_related('job__author')
+        paginator = ApplicationKeysetPagination()
+        page = await paginator.apaginate_queryset(queryset, request, self)
+        # everything the serializer reads was joined in, so this is CPU only
+        data = serializer_class(page, many=True, context={'request': request}).data
+        return paginator.get_paginated_data(data)
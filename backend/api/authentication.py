@@ -0,0 +1,99 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def user_cache():
+    return caches[settings.AUTH_USER_CACHE_ALIAS]
+
+
+def user_cache_key(user_id):
+    return f'jobfinder:authuser:{user_id}'
+
+
+def forget_user(user_id):
+    user_cache().delete(user_cache_key(user_id))
+
+
+# What the cache keeps of a user: who it is (as job and application
+# responses name it) and what it may do. Not the password hash; the
+# revocation check compares against its digest instead.
+CACHED_USER_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name', 'role', 'is_active', 'is_staff',
+                      'is_superuser')
+
+
+def cache_entry(user):
+    entry = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+    entry['password_digest'] = get_md5_hash_password(user.password)
+    return entry
+
+
+def cached_user(entry):
+    # the other fields are deferred and load on access
+    model = get_user_model()
+    names = [field.attname for field in model._meta.concrete_fields if field.attname in CACHED_USER_FIELDS]
+    return model.from_db(DEFAULT_DB_ALIAS, names, [entry[name] for name in names])
+
+
+def loaded_user(user):
+    # the whole user, for views that show or read the profile
+    if not user.get_deferred_fields():
+        return user
+    return type(user)._default_manager.get(pk=user.pk)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that remembers the token's user (CACHED_USER_FIELDS)
+    for AUTH_USER_CACHE_TIMEOUT seconds instead of selecting it on every request.
+    Entries are dropped whenever the user is saved or deleted (api/signals.py)
+    and the active/revocation checks still run on every request.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)  # raises InvalidToken
+
+        cache = user_cache()
+        key = user_cache_key(user_id)
+        entry = cache.get(key)
+        if entry is None:
+            user = super().get_user(validated_token)
+            cache.set(key, cache_entry(user), settings.AUTH_USER_CACHE_TIMEOUT)
+            return user
+        return self.check_cached_user(entry, validated_token)
+
+    async def aauthenticate(self, request):
+        # authenticate() for the async views (api/async_views.py)
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        cache = user_cache()
+        entry = await cache.aget(user_cache_key(user_id)) if user_id is not None else None
+        if entry is None:
+            return await sync_to_async(self.get_user)(validated_token)
+        return self.check_cached_user(entry, validated_token)
+
+    def check_cached_user(self, entry, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not entry['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != entry['password_digest']:
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return cached_user(entry)
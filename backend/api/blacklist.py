@@ -0,0 +1,173 @@
+import datetime
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from . import metrics
+from .models import BlacklistedToken
+
+
+# Refresh tokens used up by rotation, in place of simplejwt's token_blacklist
+# app (which writes an OutstandingToken per issued token, looks both tables up
+# on every refresh and never deletes anything).
+#
+# A token's jti is stored in BlacklistedToken with the token's own expiry;
+# once that passes, the JWT check rejects the token anyway, so the row can go
+# (purge_token_blacklist deletes them in batches along the expires_at index).
+#
+# Each process keeps a Bloom filter of the stored jtis, loaded on first use
+# and topped up with newer rows every TOKEN_BLACKLIST_SYNC_SECONDS. A token
+# the filter has never seen is not blacklisted, unless another process
+# blacklisted it since the last sync: that is what the shared cache marker
+# (TOKEN_BLACKLIST_CACHE_ALIAS) is for. Only the filter's "maybe" - a reused
+# token, or about TOKEN_BLACKLIST_BLOOM_ERROR_RATE of the others - reads the
+# table. Blacklisting itself is one INSERT ... ON CONFLICT DO NOTHING, so of
+# two concurrent refreshes of one token only one gets a new token.
+
+PREFIX = 'jobfinder:blacklist:'
+
+
+def marker_cache():
+    return caches[settings.TOKEN_BLACKLIST_CACHE_ALIAS]
+
+
+class BloomFilter:
+    """
+    Strings added to it are always found; others are found (wrongly) about
+    `error_rate` of the time while it holds no more than `capacity`.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key):
+        # double hashing over one blake2b digest; hash() differs between processes
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(key))
+
+
+class TokenBlacklist:
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self.bloom = None
+        self.last_id = 0
+        self.synced_at = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        tokens = BlacklistedToken.objects.using(self.using).filter(expires_at__gt=timezone.now())
+        # room to grow before the error rate climbs; reloaded once it's full
+        capacity = max(settings.TOKEN_BLACKLIST_BLOOM_CAPACITY, 2 * tokens.count())
+        bloom = BloomFilter(capacity, settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE)
+        last_id = 0
+        for pk, jti in tokens.values_list('pk', 'jti').iterator(chunk_size=5000):
+            bloom.add(jti)
+            last_id = max(last_id, pk)
+        self.bloom, self.last_id = bloom, last_id
+
+    def sync(self):
+        with self.lock:
+            now = time.monotonic()
+            if self.synced_at is not None and now - self.synced_at < settings.TOKEN_BLACKLIST_SYNC_SECONDS:
+                return
+            self.synced_at = now
+            if self.bloom is None or self.bloom.count > self.bloom.capacity:
+                self.load()  # which also leaves out the expired ones
+                return
+            rows = (BlacklistedToken.objects.using(self.using).filter(pk__gt=self.last_id)
+                    .values_list('pk', 'jti'))
+            for pk, jti in rows:
+                self.bloom.add(jti)
+                self.last_id = max(self.last_id, pk)
+
+    def is_blacklisted(self, jti):
+        self.sync()
+        if jti not in self.bloom:
+            if marker_cache().get(PREFIX + jti) is None:
+                metrics.incr('token_blacklist.skipped_db')
+                return False
+            return True
+        metrics.incr('token_blacklist.db_checks')
+        return BlacklistedToken.objects.using(self.using).filter(jti=jti).exists()
+
+    def add(self, jti, exp):
+        """
+        Blacklist the token `jti`, which expires at the timestamp `exp`.
+        Returns False if it already was.
+        """
+        connection = connections[self.using]
+        table = connection.ops.quote_name(BlacklistedToken._meta.db_table)
+        expires_at = datetime.datetime.fromtimestamp(exp, tz=datetime.timezone.utc)
+        expires_at = BlacklistedToken._meta.get_field('expires_at').get_db_prep_value(expires_at, connection)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (jti, expires_at) VALUES (%s, %s) "
+                f"ON CONFLICT (jti) DO NOTHING RETURNING id",
+                [jti, expires_at],
+            )
+            added = cursor.fetchone() is not None
+
+        with self.lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+        if added:
+            # until every process has synced past it, or the token expires
+            remaining = exp - time.time()
+            marker_cache().set(PREFIX + jti, 1, max(1, min(remaining, 2 * settings.TOKEN_BLACKLIST_SYNC_SECONDS)))
+        return added
+
+
+def purge(using=DEFAULT_DB_ALIAS, batch_size=5000, pause=0):
+    """
+    Delete the blacklisted tokens that have expired, `batch_size` rows per
+    statement with `pause` seconds in between. Returns how many went.
+    """
+    model = BlacklistedToken.objects.using(using)
+    expired = model.filter(expires_at__lte=timezone.now()).order_by('expires_at')
+    deleted = 0
+    while True:
+        ids = list(expired.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += model.filter(pk__in=ids).delete()[0]
+        if pause:
+            time.sleep(pause)
+
+
+# This process's blacklist, loaded on first use
+_blacklist = None
+_blacklist_lock = threading.Lock()
+
+
+def get_blacklist():
+    global _blacklist
+    with _blacklist_lock:
+        if _blacklist is None:
+            _blacklist = TokenBlacklist()
+        return _blacklist
+
+
+def reset():
+    global _blacklist
+    with _blacklist_lock:
+        _blacklist = None
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import time
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from . import metrics, routers
+
+
+# Versioned response cache for the public job endpoints.
+#
+# Every cached entry is keyed by the current "jobs generation", a timestamp
+# bumped whenever a JobPosting or CustomUser is saved or deleted (api/signals.py).
+# Bumping it orphans all older entries at once, so nothing needs to be deleted
+# and no stale job or author name is ever served. The generation also doubles
+# as the Last-Modified time.
+
+GENERATION_KEY = 'jobfinder:jobs:generation'
+
+
+def response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def current_generation():
+    cache = response_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns() // 1000, None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    # Always move to a later whole second, so Last-Modified changes too and an
+    # If-Modified-Since from earlier in the same second can't match.
+    cache = response_cache()
+    current = cache.get(GENERATION_KEY) or 0
+    cache.set(GENERATION_KEY, max(time.time_ns() // 1000, (current // 1_000_000 + 1) * 1_000_000), None)
+
+
+class CachedResponseMixin:
+    # Caches successful GET responses of a DRF view, per URL, until the next
+    # generation bump or RESPONSE_CACHE_TIMEOUT. Clients get ETag and
+    # Last-Modified and are answered 304 when their copy is current.
+    # Only for views whose output doesn't depend on who is asking.
+
+    cache_metric = 'response_cache'
+
+    def get(self, request, *args, **kwargs):
+        generation = current_generation()
+        url = request.build_absolute_uri()
+        accept = request.META.get('HTTP_ACCEPT', '')
+        digest = hashlib.sha1(f'{url}|{accept}'.encode()).hexdigest()
+        key = f'jobfinder:response:{generation}:{digest}'
+        cache = response_cache()
+
+        entry = cache.get(key)
+        if entry is None:
+            metrics.incr(f'{self.cache_metric}.miss')
+            # right after a write the replicas may lag, and a stale page would
+            # be cached under the new generation
+            lagging = routers.within_lag_window(generation / 1_000_000)
+            with routers.use_primary() if lagging else nullcontext():
+                response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            body = json.dumps(response.data, cls=DjangoJSONEncoder, sort_keys=True)
+            entry = {'data': response.data, 'etag': '"%s"' % hashlib.sha1(body.encode()).hexdigest()}
+            cache.set(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+            state = 'MISS'
+        else:
+            metrics.incr(f'{self.cache_metric}.hit')
+            response = None
+            state = 'HIT'
+
+        last_modified = generation // 1_000_000
+        not_modified = get_conditional_response(request, etag=entry['etag'], last_modified=last_modified)
+        if not_modified is not None:
+            metrics.incr(f'{self.cache_metric}.not_modified')
+            return not_modified
+
+        if response is None:
+            response = Response(entry['data'])
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'no-cache'
+        response['X-Cache'] = state
+        return response
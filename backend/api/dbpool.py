@@ -0,0 +1,103 @@
+import os
+
+import dj_database_url
+from django.db import connections
+
+
+# Connection reuse for the default database, configured from the environment:
+#
+#   DB_POOL=true            psycopg 3 connection pool (PostgreSQL only), sized by
+#                           DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE; a request waits at
+#                           most DB_POOL_TIMEOUT seconds for a free connection
+#   DB_CONN_MAX_AGE=600     without the pool, keep each worker's connection open
+#                           this many seconds instead of reconnecting per request
+#
+# Either way connections are health-checked before use (a cheap round trip
+# when taken from the pool, or when a kept connection starts a new request),
+# so a database restart costs one reconnect instead of a failed request.
+#
+# Pools are per process. gunicorn.conf.py closes anything the master opened
+# before it forks, so workers never share a socket.
+
+POOL_DEFAULTS = {
+    'min_size': 2,
+    'max_size': 10,
+    'timeout': 10,
+    'max_idle': 300,
+    'max_lifetime': 1800,
+}
+
+
+def env_flag(environ, name):
+    return environ.get(name, 'False').lower() == 'true'
+
+
+def pool_options(environ):
+    options = {}
+    for name, default in POOL_DEFAULTS.items():
+        raw = environ.get(f'DB_POOL_{name.upper()}')
+        options[name] = type(default)(raw) if raw else default
+    if options['min_size'] > options['max_size']:
+        options['min_size'] = options['max_size']
+    return options
+
+
+def database_settings(url, environ=os.environ):
+    config = dj_database_url.parse(url, conn_health_checks=True)
+    if env_flag(environ, 'DB_POOL') and config['ENGINE'] == 'django.db.backends.postgresql':
+        # Django refuses CONN_MAX_AGE together with a pool; the pool keeps them
+        config['CONN_MAX_AGE'] = 0
+        config.setdefault('OPTIONS', {})['pool'] = pool_options(environ)
+    else:
+        config['CONN_MAX_AGE'] = int(environ.get('DB_CONN_MAX_AGE', '0'))
+    return config
+
+
+def replica_settings(url, environ=os.environ):
+    config = database_settings(url, environ)
+    # tests run against the primary's test database instead
+    config['TEST'] = {'MIRROR': 'default'}
+    return config
+
+
+def pool_stats(alias='default'):
+    # Gauges and counters of this process's pool, or None when not pooling
+    connection = connections[alias]
+    if not connection.settings_dict.get('OPTIONS', {}).get('pool'):
+        return None
+    stats = connection.pool.get_stats()
+    size = stats.get('pool_size', 0)
+    idle = stats.get('pool_available', 0)
+    requests = stats.get('requests_num', 0)
+    wait_ms = stats.get('requests_wait_ms', 0)
+    return {
+        'size': size,
+        'max_size': stats.get('pool_max', 0),
+        'in_use': size - idle,
+        'idle': idle,
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': requests,
+        'wait_ms': wait_ms,
+        'wait_ms_avg': round(wait_ms / requests, 2) if requests else 0,
+        'timeouts': stats.get('requests_errors', 0),
+        'connections_lost': stats.get('connections_lost', 0),
+        'bad_returns': stats.get('returns_bad', 0),
+    }
+
+
+def pool_metrics():
+    # pool_stats() for every pooled alias, flattened like metrics.snapshot()
+    data = {}
+    for alias in connections:
+        stats = pool_stats(alias)
+        for name, value in (stats or {}).items():
+            data[f'db_pool.{alias}.{name}'] = value
+    return data
+
+
+def close_connections():
+    # Close this process's connections and pools, e.g. in a parent about to fork
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+        if hasattr(connection, 'close_pool'):
+            connection.close_pool()
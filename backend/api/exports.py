@@ -0,0 +1,90 @@
+import csv
+import io
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Applications
+
+
+# Streaming applicant exports for employers. Rows come off a chunked iterator
+# (a server-side cursor on PostgreSQL) and are written out a chunk at a time,
+# so memory stays flat however many applicants a posting has.
+
+EXPORT_COLUMNS = (
+    ('application_id', 'id'),
+    ('application_status', 'application_status'),
+    ('date', 'date'),
+    ('job_id', 'job_id'),
+    ('job_title', 'job__job_title'),
+    ('username', 'user__username'),
+    ('email', 'user__email'),
+    ('first_name', 'user__first_name'),
+    ('last_name', 'user__last_name'),
+    ('mobile', 'user__mobile'),
+    ('location', 'user__location'),
+    ('user_title', 'user__user_title'),
+    ('skills', 'user__skills'),
+    ('linkedin', 'user__linkedin'),
+    ('github', 'user__github'),
+)
+EXPORT_CHUNK_SIZE = 2000
+
+# Spreadsheet apps treat cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def export_rows(queryset):
+    return (queryset.order_by('job_id', 'id')
+            .values_list(*[source for _, source in EXPORT_COLUMNS])
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE))
+
+
+def chunked(rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == EXPORT_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def safe_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(queryset):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    yield buffer.getvalue()
+    for chunk in chunked(export_rows(queryset)):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([safe_cell(value) for value in row] for row in chunk)
+        yield buffer.getvalue()
+
+
+def stream_ndjson(queryset):
+    names = [name for name, _ in EXPORT_COLUMNS]
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for chunk in chunked(export_rows(queryset)):
+        yield ''.join(encoder.encode(dict(zip(names, row))) + '\n' for row in chunk)
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', stream_csv),
+    'ndjson': ('application/x-ndjson', stream_ndjson),
+}
+
+
+def export_queryset(user, job=None, status=None):
+    queryset = Applications.objects.filter(job__author=user)
+    if job is not None:
+        queryset = queryset.filter(job_id=job)
+    if status:
+        queryset = queryset.filter(application_status=status)
+    return queryset
@@ -0,0 +1,153 @@
+import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Count, Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import JobPosting
+
+
+# Query parameters understood by JobPostingFilterBackend
+FILTER_PARAMS = ('job_setup', 'job_type', 'salary_min', 'salary_max', 'location',
+                 'posted_after', 'posted_before', 'author')
+
+
+def parse_choices(params, name, choices):
+    raw = params.get(name)
+    if not raw:
+        return None
+    values = [value.strip() for value in raw.split(',') if value.strip()]
+    invalid = [value for value in values if value not in choices]
+    if invalid:
+        raise ValidationError({name: f"Invalid choice(s): {', '.join(invalid)}."})
+    return values
+
+
+def parse_decimal(params, name):
+    raw = params.get(name)
+    if not raw:
+        return None
+    try:
+        return Decimal(raw)
+    except InvalidOperation:
+        raise ValidationError({name: "Must be a number."})
+
+
+def parse_moment(params, name):
+    raw = params.get(name)
+    if not raw:
+        return None
+    value = parse_datetime(raw)
+    if value is None:
+        day = parse_date(raw)
+        if day is None:
+            raise ValidationError({name: "Must be an ISO date or datetime."})
+        value = datetime.datetime.combine(day, datetime.time.min)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def parse_int(params, name):
+    raw = params.get(name)
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValidationError({name: "Must be an integer."})
+
+
+class JobPostingFilterBackend(BaseFilterBackend):
+    """
+    Filters the job list on indexed columns:
+
+        ?job_setup=Remote,Hybrid  ?job_type=Full-Time
+        ?salary_min=30000&salary_max=60000   (ranges that overlap)
+        ?location=Manila          (case-insensitive exact match)
+        ?posted_after=2025-07-01&posted_before=2025-08-01
+        ?author=12
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_jobs(queryset, request.query_params)
+
+
+def filter_jobs(queryset, params):
+    filters = Q()
+
+    job_setup = parse_choices(params, 'job_setup', JobPosting.JOB_SETUP_CHOICES)
+    if job_setup:
+        filters &= Q(job_setup__in=job_setup)
+
+    job_type = parse_choices(params, 'job_type', JobPosting.JOB_TYPE_CHOICES)
+    if job_type:
+        filters &= Q(job_type__in=job_type)
+
+    salary_min = parse_decimal(params, 'salary_min')
+    if salary_min is not None:
+        filters &= Q(max_salary__gte=salary_min)
+
+    salary_max = parse_decimal(params, 'salary_max')
+    if salary_max is not None:
+        filters &= Q(min_salary__lte=salary_max)
+
+    posted_after = parse_moment(params, 'posted_after')
+    if posted_after:
+        filters &= Q(created_at__gte=posted_after)
+
+    posted_before = parse_moment(params, 'posted_before')
+    if posted_before:
+        filters &= Q(created_at__lt=posted_before)
+
+    author = parse_int(params, 'author')
+    if author is not None:
+        filters &= Q(author_id=author)
+
+    location = params.get('location', '').strip()
+    if location:
+        # matches the Lower(job_location) expression index
+        queryset = queryset.alias(location_key=Lower('job_location'))
+        filters &= Q(location_key=location.lower())
+
+    return queryset.filter(filters)
+
+
+# Lower bounds of the min_salary histogram buckets; the last one is open-ended
+SALARY_BUCKETS = (0, 20000, 40000, 60000, 80000, 100000)
+
+
+def job_facets(queryset):
+    # Counts per job_setup, per job_type and per salary bucket, all from one
+    # aggregate query using conditional COUNTs.
+    setups = list(JobPosting.JOB_SETUP_CHOICES)
+    types = list(JobPosting.JOB_TYPE_CHOICES)
+    aggregates = {'total': Count('id')}
+    for i, value in enumerate(setups):
+        aggregates[f'setup_{i}'] = Count('id', filter=Q(job_setup=value))
+    for i, value in enumerate(types):
+        aggregates[f'type_{i}'] = Count('id', filter=Q(job_type=value))
+    for i, low in enumerate(SALARY_BUCKETS):
+        bucket = Q(min_salary__gte=low)
+        if i + 1 < len(SALARY_BUCKETS):
+            bucket &= Q(min_salary__lt=SALARY_BUCKETS[i + 1])
+        aggregates[f'salary_{i}'] = Count('id', filter=bucket)
+
+    row = queryset.order_by().aggregate(**aggregates)
+    return {
+        'total': row['total'],
+        'job_setup': {value: row[f'setup_{i}'] for i, value in enumerate(setups)},
+        'job_type': {value: row[f'type_{i}'] for i, value in enumerate(types)},
+        'salary': [
+            {
+                'min': low,
+                'max': SALARY_BUCKETS[i + 1] if i + 1 < len(SALARY_BUCKETS) else None,
+                'count': row[f'salary_{i}'],
+            }
+            for i, low in enumerate(SALARY_BUCKETS)
+        ],
+    }
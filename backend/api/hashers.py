@@ -0,0 +1,111 @@
+import asyncio
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from . import metrics
+
+
+# Password hashing off the request threads. PBKDF2 is ~1M rounds of pure CPU
+# per login, signup or password reset; a burst of them on every worker thread
+# at once leaves nothing for the requests that only wait on the database.
+#
+# OffloadedPBKDF2PasswordHasher (settings.PASSWORD_HASHERS) runs each hash on
+# a small per-process pool of PASSWORD_HASH_WORKERS threads. hashlib releases
+# the GIL while it works, so other request threads keep running meanwhile.
+# At most PASSWORD_HASH_QUEUE more hashes may wait for a thread; a request
+# that can't get in line within PASSWORD_HASH_QUEUE_TIMEOUT seconds gets a
+# 503 with Retry-After instead of piling up. PASSWORD_HASH_WORKERS=0 hashes
+# on the calling thread as before.
+
+
+class HashingOverloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many sign-ins at the moment, try again shortly.'
+    default_code = 'hashing_overloaded'
+
+    def __init__(self, wait):
+        super().__init__()
+        self.wait = wait  # sent as Retry-After
+
+
+class HashingPool:
+    def __init__(self, workers, queue, timeout):
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix='password-hash')
+        # running plus waiting hashes
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.timeout = timeout
+
+    def submit(self, fn, *args):
+        if not self.slots.acquire(timeout=self.timeout):
+            metrics.incr('password_hash.rejected')
+            raise HashingOverloaded(max(1, math.ceil(self.timeout)))
+        def task():
+            try:
+                return fn(*args)
+            finally:
+                self.slots.release()  # before the caller sees the result
+
+        try:
+            return self.executor.submit(task)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def run(self, fn, *args):
+        return self.submit(fn, *args).result()
+
+    async def arun(self, fn, *args):
+        # for async views: waits without holding the event loop
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+# This process's pool, started on first use (so after gunicorn forks)
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = HashingPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE,
+                                settings.PASSWORD_HASH_QUEUE_TIMEOUT)
+        return _pool
+
+
+def reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+
+
+@receiver(setting_changed)
+def resize_pool(setting, **kwargs):
+    if setting.startswith('PASSWORD_HASH_'):
+        reset_pool()
+
+
+class OffloadedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    # Same algorithm name and output as PBKDF2PasswordHasher, so existing
+    # hashes verify unchanged; verify() and harden_runtime() go through encode()
+
+    def encode(self, password, salt, iterations=None):
+        pool = get_pool()
+        if pool is None or threading.current_thread().name.startswith('password-hash'):
+            return super().encode(password, salt, iterations)
+        return pool.run(super().encode, password, salt, iterations)
@@ -0,0 +1,103 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+
+from api import skills
+from api.models import CustomUser, Skill, UserSkill
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Time candidate search through the skill index against synthetic users, next to the "
+            "icontains scan over CustomUser.skills it replaces. Everything is rolled back afterwards.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000)
+        parser.add_argument('--vocabulary', type=int, default=5000)
+        parser.add_argument('--skills-per-user', type=int, default=6)
+        parser.add_argument('--queries', type=int, default=50)
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=7)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic(options['database']):
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        rng = np.random.default_rng(options['seed'])
+        using, users, vocabulary = options['database'], options['users'], options['vocabulary']
+        names = [f'skill{i:05d}' for i in range(vocabulary)]
+        # a few skills are everywhere, most are rare
+        popularity = 1 / np.arange(1, vocabulary + 1) ** 1.1
+        popularity /= popularity.sum()
+
+        start = time.perf_counter()
+        first_id = (CustomUser.objects.using(using).order_by('-id').values_list('id', flat=True).first() or 0) + 1
+        picks = rng.choice(vocabulary, size=(users, options['skills_per_user']), p=popularity)
+        Skill.objects.using(using).bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+        skill_ids = dict(Skill.objects.using(using).filter(name__in=names).values_list('name', 'id'))
+        for offset in range(0, users, 10_000):
+            rows = picks[offset:offset + 10_000]
+            user_ids = range(first_id + offset, first_id + offset + len(rows))
+            CustomUser.objects.using(using).bulk_create([
+                CustomUser(id=user_id, username=f'bench{user_id}', email=f'bench{user_id}@example.com',
+                           skills=', '.join(names[i] for i in row))
+                for user_id, row in zip(user_ids, rows)])
+            UserSkill.objects.using(using).bulk_create([
+                UserSkill(user_id=user_id, skill_id=skill_ids[names[i]])
+                for user_id, row in zip(user_ids, rows) for i in set(row)])
+        counts = UserSkill.objects.using(using).values('skill_id').annotate(count=Count('id'))
+        for row in counts.values_list('skill_id', 'count'):
+            Skill.objects.using(using).filter(id=row[0]).update(user_count=row[1])
+        self.stdout.write(f'{users:,} users, {UserSkill.objects.using(using).count():,} skill links, '
+                          f'seeded in {time.perf_counter() - start:.0f}s')
+
+        # pairs/triples of less common skills, with or without one of the commonest
+        def query(size, common):
+            picked = [int(i) for i in rng.integers(20, 500, size=size)]
+            if common:
+                picked[0] = int(rng.integers(20))
+            return [names[i] for i in picked]
+
+        groups = {common: [query(size, common) for size in (2, 3) for _ in range(options['queries'] // 2)]
+                  for common in (True, False)}
+        limit = options['limit']
+
+        def indexed(query, match):
+            known = list(Skill.objects.using(using).filter(name__in=query))
+            return skills.candidate_ids(known, match, 0, limit)
+
+        def scan(query, match):
+            condition = Q()
+            for name in query:
+                # the old way: substring match on the free text
+                term = Q(skills__icontains=name)
+                condition = condition & term if match == 'all' else condition | term
+            return list(CustomUser.objects.using(using).filter(condition).order_by('id')
+                        .values_list('id', flat=True)[:limit])
+
+        for match in ('all', 'any'):
+            for common, queries in groups.items():
+                for name, fn in (('skill index', indexed), ('icontains scan', scan)):
+                    fn(queries[0], match)  # warm up
+                    timings = []
+                    for skill_names in queries:
+                        start = time.perf_counter()
+                        fn(skill_names, match)
+                        timings.append((time.perf_counter() - start) * 1000)
+                    timings = np.array(timings)
+                    label = f"{match} {'with' if common else 'no'} common"
+                    self.stdout.write(f'{label:<16} {name:<15} mean {timings.mean():8.1f} ms  '
+                                      f'p50 {np.percentile(timings, 50):8.1f} ms  '
+                                      f'p99 {np.percentile(timings, 99):8.1f} ms')
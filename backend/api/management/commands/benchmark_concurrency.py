@@ -0,0 +1,78 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = ("Hammer a running server with N concurrent keep-alive clients and report requests/sec "
+            "and latency percentiles. Compare the WSGI and ASGI deployments (see backend/README.md).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('url')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 1000])
+        parser.add_argument('--requests', type=int, default=5000, help="requests per concurrency level")
+        parser.add_argument('--token', help="JWT access token for authenticated endpoints")
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        target = url.path + (f'?{url.query}' if url.query else '')
+        headers = f'GET {target} HTTP/1.1\r\nHost: {url.netloc}\r\nAccept: application/json\r\n'
+        if options['token']:
+            headers += f'Authorization: Bearer {options["token"]}\r\n'
+        request = (headers + '\r\n').encode()
+
+        self.stdout.write(f'{"clients":>8} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8} {"errors":>7}')
+        for clients in options['concurrency']:
+            latencies, errors, elapsed = asyncio.run(
+                self.run(url.hostname, url.port or 80, request, clients, options['requests']))
+            latencies.sort()
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0
+            self.stdout.write(f'{clients:>8} {len(latencies) / elapsed:>9.0f} '
+                              f'{statistics.median(latencies or [0]) * 1000:>8.1f} {p99 * 1000:>8.1f} {errors:>7}')
+
+    async def run(self, host, port, request, clients, total):
+        latencies, errors = [], 0
+        remaining = iter(range(total))
+
+        async def client():
+            nonlocal errors
+            reader = writer = None
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    if writer is None:
+                        reader, writer = await asyncio.open_connection(host, port)
+                    writer.write(request)
+                    status, keep_alive = await self.read_response(reader)
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    errors += 1
+                    writer = None
+                    continue
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+                if not keep_alive:
+                    writer.close()
+                    writer = None
+            if writer is not None:
+                writer.close()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        return latencies, errors, time.perf_counter() - start
+
+    @staticmethod
+    async def read_response(reader):
+        head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+        status = int(head[0].split()[1])
+        headers = dict(line.split(':', 1) for line in head[1:] if ':' in line)
+        headers = {name.strip().lower(): value.strip().lower() for name, value in headers.items()}
+        if 'content-length' in headers:
+            await reader.readexactly(int(headers['content-length']))
+            return status, headers.get('connection') != 'close'
+        await reader.read()  # no length: body runs to EOF
+        return status, False
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.models import CustomUser, JobPosting
+from api.serializers import JobCardProjection, JobSearchSerializer, JobSerializer
+
+
+class Command(BaseCommand):
+    help = ("Compare job card list throughput of the DRF serializers against JobCardProjection. "
+            "Seeds throwaway rows inside a transaction that is rolled back.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[20, 100, 1000])
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(max(options['rows']))
+            for serializer_class in (JobSerializer, JobSearchSerializer):
+                for rows in options['rows']:
+                    self.compare(serializer_class, rows, options['repeat'])
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        author = CustomUser.objects.create(username='benchmark-author', email='benchmark@example.com',
+                                           first_name='Bench', last_name='Mark')
+        JobPosting.objects.bulk_create([
+            JobPosting(author=author, job_title=f'Engineer {i}', job_company='Acme', job_location='Manila',
+                       job_setup='Remote', job_type='Full-Time', min_salary='30000.00', max_salary='50000.50',
+                       job_description='Build and run APIs. ' * 20, job_requirements='Python, Django',
+                       job_benefits='HMO')
+            for i in range(count)
+        ], batch_size=500)
+
+    def compare(self, serializer_class, rows, repeat):
+        renderer = JSONRenderer()
+        queryset = JobPosting.objects.select_related('author').order_by('-created_at', '-id')
+        projection = JobCardProjection.for_serializer(serializer_class)
+
+        def serializer_path():
+            return renderer.render(serializer_class(list(queryset[:rows]), many=True).data)
+
+        def projection_path():
+            return renderer.render(projection.to_representation(list(projection.values(queryset)[:rows])))
+
+        if serializer_path() != projection_path():
+            self.stderr.write(self.style.ERROR(f'{serializer_class.__name__} x{rows}: output differs'))
+            return
+        before, after = self.rate(serializer_path, rows, repeat), self.rate(projection_path, rows, repeat)
+        self.stdout.write(f'{serializer_class.__name__:<20} {rows:>5} rows  '
+                          f'serializer {before:>9.0f} rows/s  projection {after:>9.0f} rows/s  x{after / before:.1f}')
+
+    @staticmethod
+    def rate(fn, rows, repeat):
+        fn()  # warm up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return rows * repeat / (time.perf_counter() - start)
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+
+from .benchmark_concurrency import Command as ConcurrencyCommand
+
+
+class Command(BaseCommand):
+    help = ("Run a burst of logins against a running server while other clients read the job list, "
+            "and report the job list's latency next to the logins'. Start the server with "
+            "THROTTLE_RATE_LOGIN= so the logins aren't throttled (see backend/README.md).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help="server root, e.g. http://127.0.0.1:8000")
+        parser.add_argument('--username', required=True)
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--logins', type=int, default=8, help="concurrent login clients")
+        parser.add_argument('--readers', type=int, default=8, help="concurrent job list clients")
+        parser.add_argument('--seconds', type=float, default=20)
+        parser.add_argument('--token', help="JWT access token for the job list")
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        body = json.dumps({'username': options['username'], 'password': options['password']}).encode()
+        login = (f'POST /api/auth/login/ HTTP/1.1\r\nHost: {url.netloc}\r\nContent-Type: application/json\r\n'
+                 f'Content-Length: {len(body)}\r\n\r\n').encode() + body
+        read = f'GET /api/jobposting/?page_size=20 HTTP/1.1\r\nHost: {url.netloc}\r\nAccept: application/json\r\n'
+        if options['token']:
+            read += f'Authorization: Bearer {options["token"]}\r\n'
+        read = (read + '\r\n').encode()
+
+        results = asyncio.run(self.run(url.hostname, url.port or 80, options['seconds'],
+                                       [(login, options['logins']), (read, options['readers'])]))
+        self.stdout.write(f'{"":<10} {"req/s":>7} {"p50 ms":>8} {"p99 ms":>8} {"503s":>6} {"errors":>7}')
+        for name, (latencies, unavailable, errors) in zip(('logins', 'job list'), results):
+            latencies.sort()
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0
+            self.stdout.write(f'{name:<10} {len(latencies) / options["seconds"]:>7.1f} '
+                              f'{statistics.median(latencies or [0]) * 1000:>8.1f} {p99 * 1000:>8.1f} '
+                              f'{unavailable:>6} {errors:>7}')
+
+    async def run(self, host, port, seconds, groups):
+        deadline = time.perf_counter() + seconds
+
+        async def client(request, latencies, counts):
+            reader = writer = None
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    if writer is None:
+                        reader, writer = await asyncio.open_connection(host, port)
+                    writer.write(request)
+                    status, keep_alive = await ConcurrencyCommand.read_response(reader)
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    counts['errors'] += 1
+                    writer = None
+                    continue
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                elif status == 503:
+                    counts['unavailable'] += 1
+                else:
+                    counts['errors'] += 1
+                if not keep_alive:
+                    writer.close()
+                    writer = None
+            if writer is not None:
+                writer.close()
+
+        results, tasks = [], []
+        for request, clients in groups:
+            latencies, counts = [], {'unavailable': 0, 'errors': 0}
+            results.append((latencies, counts))
+            tasks += [client(request, latencies, counts) for _ in range(clients)]
+        await asyncio.gather(*tasks)
+        return [(latencies, counts['unavailable'], counts['errors']) for latencies, counts in results]
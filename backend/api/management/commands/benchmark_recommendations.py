@@ -0,0 +1,69 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from scipy import sparse
+
+from api.recommend import MAX_TERMS, N_FEATURES, JobIndex, Segment
+
+
+class Command(BaseCommand):
+    help = ("Time recommendation scoring for one user against a synthetic index of job vectors "
+            "(no database), next to a full sparse matrix-vector product over every posting.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--postings', type=int, default=1_000_000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--query-terms', type=int, default=12)
+        parser.add_argument('--vocabulary', type=int, default=50_000)
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        postings, vocabulary = options['postings'], options['vocabulary']
+        # word frequencies follow a power law, like real postings
+        features = rng.choice(N_FEATURES, size=vocabulary, replace=False).astype(np.int32)
+        popularity = 1 / np.arange(1, vocabulary + 1) ** 1.1
+        popularity /= popularity.sum()
+
+        start = time.perf_counter()
+        words = rng.choice(vocabulary, size=(postings, MAX_TERMS), p=popularity)
+        weights = rng.random((postings, MAX_TERMS), dtype=np.float32) + 0.1
+        weights /= np.linalg.norm(weights, axis=1, keepdims=True)
+        indptr = np.arange(0, postings * MAX_TERMS + 1, MAX_TERMS, dtype=np.int64)
+        matrix = sparse.csr_matrix((weights.ravel(), features[words.ravel()], indptr), shape=(postings, N_FEATURES))
+        matrix.sum_duplicates()
+        index = JobIndex(Segment(np.arange(1, postings + 1), matrix, np.zeros(postings)))
+        built = time.perf_counter() - start
+        stored = index.segments[0].matrix
+        size = stored.data.nbytes + stored.indices.nbytes + stored.indptr.nbytes
+        self.stdout.write(f'{postings:,} postings, {stored.nnz:,} stored terms, '
+                          f'{size / 2 ** 20:.0f} MiB, built in {built:.1f}s')
+
+        # skills mix a few common words with rarer ones
+        queries = []
+        for _ in range(options['queries']):
+            common = rng.choice(200, size=3)
+            picked = np.unique(np.concatenate([common, rng.choice(vocabulary, size=options['query_terms'] - 3)]))
+            terms = np.sort(features[picked])
+            query_weights = rng.random(len(terms), dtype=np.float32) + 0.1
+            queries.append((terms, query_weights / np.linalg.norm(query_weights)))
+
+        def full_scan(terms, query_weights):
+            vector = np.zeros(N_FEATURES, dtype=np.float32)
+            vector[terms] = query_weights
+            scores = matrix @ vector
+            return np.argpartition(-scores, options['limit'])[:options['limit']]
+
+        for name, fn in (('JobIndex.score', lambda terms, w: index.score(terms, w, options['limit'])),
+                         ('full CSR scan', full_scan)):
+            fn(*queries[0])  # warm up
+            timings = []
+            for terms, query_weights in queries:
+                start = time.perf_counter()
+                fn(terms, query_weights)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings = np.array(timings)
+            self.stdout.write(f'{name:<16} mean {timings.mean():7.1f} ms  p50 {np.percentile(timings, 50):7.1f} ms  '
+                              f'p99 {np.percentile(timings, 99):7.1f} ms')
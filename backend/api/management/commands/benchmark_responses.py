@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.middleware import brotli, compress
+from api.models import CustomUser, JobPosting
+from api.renderers import FastJSONRenderer
+from api.serializers import JobCardProjection, JobSerializer
+
+
+class Command(BaseCommand):
+    help = ("Report bytes and CPU per job-list page for DRF's JSONRenderer against FastJSONRenderer, "
+            "uncompressed and with gzip/brotli. Seeds throwaway rows inside a rolled-back transaction.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-sizes', type=int, nargs='+', default=[20, 100])
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(max(options['page_sizes']))
+            for page_size in options['page_sizes']:
+                self.report(page_size, options['repeat'])
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        author = CustomUser.objects.create(username='benchmark-author', email='benchmark@example.com',
+                                           first_name='Bench', last_name='Mark')
+        JobPosting.objects.bulk_create([
+            JobPosting(author=author, job_title=f'Backend Engineer {i}', job_company='Acme Corporation',
+                       job_location='Makati, Metro Manila', job_setup='Hybrid', job_type='Full-Time',
+                       min_salary='45000.00', max_salary='80000.00',
+                       job_description='Design, build and operate the APIs behind our job marketplace. ' * 6,
+                       job_requirements='3+ years of Python and Django, PostgreSQL, REST API design. ' * 3,
+                       job_benefits='HMO from day one, 13th month pay, hybrid work setup.')
+            for i in range(count)
+        ], batch_size=500)
+
+    def report(self, page_size, repeat):
+        projection = JobCardProjection.for_serializer(JobSerializer)
+        queryset = JobPosting.objects.order_by('-created_at', '-id')
+        page = {'next': None, 'previous': None,
+                'results': projection.to_representation(list(projection.values(queryset)[:page_size]))}
+
+        self.stdout.write(f'{page_size} jobs per page')
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            body, cpu = self.measure(lambda: renderer.render(page), repeat)
+            self.stdout.write(f'  {type(renderer).__name__:<18} {len(body):>8} bytes  {cpu:>8.1f} µs CPU')
+        codings = ['gzip'] + (['br'] if brotli else [])
+        body = FastJSONRenderer().render(page)
+        for coding in codings:
+            compressed, cpu = self.measure(lambda: compress(body, coding), repeat)
+            level = settings.COMPRESSION_GZIP_LEVEL if coding == 'gzip' else settings.COMPRESSION_BROTLI_QUALITY
+            self.stdout.write(f'  + {coding:<4} (level {level})     {len(compressed):>8} bytes  {cpu:>8.1f} µs CPU')
+
+    @staticmethod
+    def measure(fn, repeat):
+        result = fn()
+        start = time.process_time()
+        for _ in range(repeat):
+            fn()
+        return result, (time.process_time() - start) / repeat * 1e6
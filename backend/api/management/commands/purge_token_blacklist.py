@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api import blacklist
+
+
+class Command(BaseCommand):
+    help = "Delete blacklisted refresh tokens that have expired, in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--batch-size', type=int, default=5000, help="rows per DELETE")
+        parser.add_argument('--pause', type=float, default=0, help="seconds to sleep between batches")
+
+    def handle(self, *args, **options):
+        deleted = blacklist.purge(options['database'], options['batch_size'], options['pause'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired blacklisted tokens."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api import stats
+
+
+class Command(BaseCommand):
+    help = "Recount the per-job applicant status and daily application rollups from the Applications table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        stats.rebuild(options['database'])
+        self.stdout.write(self.style.SUCCESS("Application stats rebuilt."))
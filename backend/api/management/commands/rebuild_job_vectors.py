@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api import recommend
+
+
+class Command(BaseCommand):
+    help = "Recompute the recommendation vector of every job posting."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        recommend.rebuild(options['database'])
+        self.stdout.write(self.style.SUCCESS("Job vectors rebuilt."))
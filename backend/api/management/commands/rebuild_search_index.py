@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the job full-text and user trigram search indexes (SQLite only; PostgreSQL maintains its own)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        search.get_backend(using).rebuild(using)
+        search.get_user_backend(using).rebuild(using)
+        self.stdout.write(self.style.SUCCESS("Search indexes rebuilt."))
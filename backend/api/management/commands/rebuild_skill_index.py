@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api import skills
+
+
+class Command(BaseCommand):
+    help = "Re-parse every user's skills into the skill index used by candidate search."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        skills.rebuild(options['database'])
+        self.stdout.write(self.style.SUCCESS("Skill index rebuilt."))
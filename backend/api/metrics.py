@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.cache import caches
+
+
+# Counters kept in the configured cache, so every gunicorn worker adds to the
+# same numbers. Read them at /api/metrics/ (staff only).
+
+PREFIX = 'jobfinder:metrics:'
+NAMES_KEY = PREFIX + '_names'
+
+# names this process has already registered in NAMES_KEY
+_registered = set()
+
+
+def metrics_cache():
+    return caches[settings.METRICS_CACHE_ALIAS]
+
+
+def register(name):
+    cache = metrics_cache()
+    names = cache.get(NAMES_KEY) or set()
+    if name not in names:
+        cache.set(NAMES_KEY, names | {name}, None)
+    _registered.add(name)
+
+
+def incr(name, delta=1):
+    if name not in _registered:
+        register(name)
+    cache = metrics_cache()
+    key = PREFIX + name
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # first hit, or the cache was cleared; make sure it's listed again
+        register(name)
+        if not cache.add(key, delta, None):
+            cache.incr(key, delta)
+
+
+def snapshot():
+    cache = metrics_cache()
+    names = sorted(cache.get(NAMES_KEY) or set())
+    values = cache.get_many([PREFIX + name for name in names])
+    return {name: values.get(PREFIX + name, 0) for name in names}
@@ -0,0 +1,133 @@
+import gzip
+import re
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from . import routers
+from .authentication import CachedJWTAuthentication
+
+try:
+    import brotli
+except ImportError:  # gzip only without it
+    brotli = None
+
+
+ACCEPT_ENCODING_RE = re.compile(r'\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+# API JSON only: HTML pages (admin, browsable API) carry CSRF tokens, and
+# compressing secrets next to reflected input invites BREACH
+COMPRESSIBLE_TYPES = ('application/json',)
+
+
+def accepted_encodings(header):
+    # Accept-Encoding -> the codings the client takes (q > 0)
+    accepted = set()
+    for part in header.split(','):
+        match = ACCEPT_ENCODING_RE.match(part)
+        if not match:
+            continue
+        try:
+            weight = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+        if weight > 0:
+            accepted.add(match.group(1).lower())
+    return accepted
+
+
+def compress(content, coding):
+    if coding == 'br':
+        return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Brotli (when installed and accepted) or gzip for JSON responses
+    of at least COMPRESSION_MIN_SIZE bytes. Small bodies aren't worth the CPU,
+    streaming and already-encoded responses (e.g. WhiteNoise files) pass
+    through, and a body that doesn't shrink is sent as is.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.streaming or response.has_header('Content-Encoding')
+                or not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES)):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        coding = 'br' if brotli and 'br' in accepted else 'gzip' if 'gzip' in accepted else None
+        if coding is None:
+            return response
+
+        compressed = compress(response.content, coding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = coding
+        # the representation changed, so a strong ETag must not match it any more
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+
+def client_key(request):
+    # Who is asking, without touching the database: the JWT's user, else the
+    # session cookie. Also says whether the token was issued within the
+    # replica lag window, i.e. right after a login or signup.
+    auth = CachedJWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+    if raw_token:
+        try:
+            token = auth.get_validated_token(raw_token)
+        except InvalidToken:
+            token = None  # the view answers 401
+        user_id = token.get(api_settings.USER_ID_CLAIM) if token else None
+        if user_id is not None:
+            return f'user:{user_id}', routers.within_lag_window(token.get('iat', 0))
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if session_key:
+        return f'session:{session_key}', False
+    return None, False
+
+
+def sticky_key(client):
+    return f'jobfinder:sticky:{client}'
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Read-your-writes for api/routers.py: a client that wrote something reads
+    from the primary for the next REPLICA_STICKY_SECONDS, and so does a client
+    with a freshly issued token. Does nothing without DATABASE_REPLICAS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        cache = caches[settings.REPLICA_STICKY_CACHE_ALIAS]
+        client, fresh_token = client_key(request)
+        pinned = (request.method not in SAFE_METHODS or fresh_token
+                  or (client is not None and bool(cache.get(sticky_key(client)))))
+        with routers.routing(pinned=pinned) as state:
+            response = self.get_response(request)
+        if state.wrote and client is not None:
+            cache.set(sticky_key(client), True, settings.REPLICA_STICKY_SECONDS)
+        return response
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE api_jobposting ADD COLUMN search_document tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(job_title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(job_company, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(job_location, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(job_requirements, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(job_description, '')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX api_jobposting_search_gin ON api_jobposting USING GIN (search_document)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS api_jobposting_search_gin",
+    "ALTER TABLE api_jobposting DROP COLUMN IF EXISTS search_document",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE api_jobposting_fts USING fts5(
+        job_title, job_company, job_location, job_description, job_requirements,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    # bm25 column weights, in the column order above
+    "INSERT INTO api_jobposting_fts (api_jobposting_fts, rank) VALUES ('rank', 'bm25(10.0, 4.0, 4.0, 1.0, 2.0)')",
+    """
+    INSERT INTO api_jobposting_fts (rowid, job_title, job_company, job_location, job_description, job_requirements)
+    SELECT id, job_title, job_company, job_location, job_description, job_requirements FROM api_jobposting
+    """,
+]
+SQLITE_REVERSE = [
+    "DROP TABLE IF EXISTS api_jobposting_fts",
+]
+
+
+def run_for_vendor(postgres, sqlite):
+    def run(apps, schema_editor):
+        statements = postgres if schema_editor.connection.vendor == 'postgresql' else sqlite
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_alter_customuser_first_name_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobPostingSearchIndex',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='api.jobposting')),
+                ('document', models.TextField(db_column='api_jobposting_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'api_jobposting_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(POSTGRES_REVERSE, SQLITE_REVERSE),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_job_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applications',
+            index=models.Index(fields=['user', '-date', '-id'], name='application_user_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['-created_at', '-id'], name='jobposting_feed_idx'),
+        ),
+    ]
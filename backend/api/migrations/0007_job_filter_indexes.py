@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:21
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['job_setup', 'job_type', '-created_at'], name='jobposting_setup_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['job_type', '-created_at'], name='jobposting_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['min_salary', 'max_salary'], name='jobposting_salary_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(django.db.models.functions.text.Lower('job_location'), models.OrderBy(models.F('created_at'), descending=True), name='jobposting_location_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:25
+
+import django.db.models.deletion
+from django.conf import settings
+import re
+
+from django.db import migrations, models
+
+
+TRIGRAM_FIELDS = ('username', 'email', 'first_name', 'last_name')
+
+
+def trigrams(text):
+    grams = set()
+    for word in re.findall(r'\w+', text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def forwards(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for field in TRIGRAM_FIELDS:
+            schema_editor.execute(
+                f"CREATE INDEX api_customuser_{field}_trgm ON api_customuser USING GIN ({field} gin_trgm_ops)")
+        return
+
+    CustomUser = apps.get_model('api', 'CustomUser')
+    UserSearchGram = apps.get_model('api', 'UserSearchGram')
+    db = schema_editor.connection.alias
+    for user in CustomUser.objects.using(db).only('pk', *TRIGRAM_FIELDS).iterator(chunk_size=500):
+        grams = set()
+        for field in TRIGRAM_FIELDS:
+            grams |= trigrams(getattr(user, field) or '')
+        UserSearchGram.objects.using(db).bulk_create(
+            [UserSearchGram(user_id=user.pk, gram=gram) for gram in grams])
+
+
+def backwards(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for field in TRIGRAM_FIELDS:
+            schema_editor.execute(f"DROP INDEX IF EXISTS api_customuser_{field}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_author_feed_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchGram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gram', models.CharField(max_length=3)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_grams', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('gram', 'user')},
+            },
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
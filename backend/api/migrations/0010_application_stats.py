@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill(apps, schema_editor):
+    Applications = apps.get_model('api', 'Applications')
+    JobStatusCount = apps.get_model('api', 'JobStatusCount')
+    JobDailyApplications = apps.get_model('api', 'JobDailyApplications')
+    db = schema_editor.connection.alias
+    applications = Applications.objects.using(db).order_by()
+    JobStatusCount.objects.using(db).bulk_create([
+        JobStatusCount(job_id=row['job_id'], status=row['application_status'], count=row['n'])
+        for row in applications.values('job_id', 'application_status').annotate(n=Count('id'))
+    ], batch_size=1000)
+    JobDailyApplications.objects.using(db).bulk_create([
+        JobDailyApplications(job_id=row['job_id'], date=row['date'], count=row['n'])
+        for row in applications.values('job_id', 'date').annotate(n=Count('id'))
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_user_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDailyApplications',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_applications', to='api.jobposting')),
+            ],
+            options={
+                'unique_together': {('job', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='JobStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('Under Review', 'Under Review'), ('Interview', 'Interview'), ('Accepted', 'Accepted'), ('Rejected', 'Rejected')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_counts', to='api.jobposting')),
+            ],
+            options={
+                'unique_together': {('job', 'status')},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_application_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applications',
+            index=models.Index(fields=['-date', '-id'], name='application_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['job_company', '-created_at'], name='jobposting_company_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:57
+
+import time
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # the tokenizing and hashing has to match what the save signal writes
+    from api.recommend import JOB_FIELDS, text_vector
+
+    JobPosting = apps.get_model('api', 'JobPosting')
+    JobVector = apps.get_model('api', 'JobVector')
+    db = schema_editor.connection.alias
+    vectors = []
+    for job in JobPosting.objects.using(db).only('pk', *[field for field, _ in JOB_FIELDS]).iterator(chunk_size=500):
+        terms, weights = text_vector([(getattr(job, field), weight) for field, weight in JOB_FIELDS])
+        vectors.append(JobVector(job_id=job.pk, terms=terms.tobytes(), weights=weights.tobytes(),
+                                 revision=time.time_ns()))
+        if len(vectors) == 500:
+            JobVector.objects.using(db).bulk_create(vectors)
+            vectors = []
+    JobVector.objects.using(db).bulk_create(vectors)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobVector',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='vector', serialize=False, to='api.jobposting')),
+                ('terms', models.BinaryField()),
+                ('weights', models.BinaryField()),
+                ('revision', models.BigIntegerField(db_index=True)),
+            ],
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
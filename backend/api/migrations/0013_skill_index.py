@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:06
+
+import django.db.models.deletion
+import re
+from itertools import islice
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# parsed the same way as by the save signal (api.skills.parse_skills)
+SEPARATORS_RE = re.compile(r'[,;\n|•]+')
+MAX_SKILL_LENGTH = 50
+CHUNK_SIZE = 500
+
+
+def normalize(raw):
+    return ' '.join(raw.lower().split()).strip(' -*').rstrip('.')[:MAX_SKILL_LENGTH]
+
+
+def parse_skills(text):
+    names = (normalize(part) for part in SEPARATORS_RE.split(text or ''))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def backfill(apps, schema_editor):
+    CustomUser = apps.get_model('api', 'CustomUser')
+    Skill = apps.get_model('api', 'Skill')
+    UserSkill = apps.get_model('api', 'UserSkill')
+    db = schema_editor.connection.alias
+    users = CustomUser.objects.using(db).exclude(skills='').only('pk', 'skills').iterator(chunk_size=CHUNK_SIZE)
+    ids = {}
+    for chunk in iter(lambda: list(islice(users, CHUNK_SIZE)), []):
+        parsed = [(user.pk, parse_skills(user.skills)) for user in chunk]
+        new = {name for _, names in parsed for name in names} - ids.keys()
+        Skill.objects.using(db).bulk_create([Skill(name=name) for name in new])
+        ids.update(Skill.objects.using(db).filter(name__in=new).values_list('name', 'id'))
+        UserSkill.objects.using(db).bulk_create(
+            [UserSkill(user_id=user_id, skill_id=ids[name]) for user_id, names in parsed for name in names])
+    links = (UserSkill.objects.using(db).filter(skill=models.OuterRef('pk')).order_by()
+             .values('skill').annotate(count=models.Count('pk')).values('count'))
+    Skill.objects.using(db).update(user_count=models.Subquery(links))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_job_vectors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('user_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UserSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_links', to='api.skill')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('skill', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
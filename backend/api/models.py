@@ -1,7 +1,15 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth.models import AbstractUser
+from django.db.models.functions import Coalesce, Lower
 
 # Custom user model
+# what user search matches on (api/search.py)
+USER_SEARCH_FIELDS = ('username', 'email', 'first_name', 'last_name')
+
+# What job cards show of their author (JobSerializer.get_author_name)
+AUTHOR_NAME_FIELDS = ('username', 'first_name', 'last_name')
+
+
 class CustomUser(AbstractUser):
     GENDER_CHOICES = {
         'Male': 'Male',
@@ -29,9 +37,36 @@ class CustomUser(AbstractUser):
     USERNAME_FIELD = 'username' 
     REQUIRED_FIELDS = ['email'] 
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # remember the loaded skills, search fields and author name so post_save
+        # only re-indexes or invalidates on change
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_skills = instance.__dict__.get('skills')
+        instance._loaded_search = tuple(instance.__dict__.get(field) for field in USER_SEARCH_FIELDS)
+        instance._loaded_author_name = tuple(instance.__dict__.get(field) for field in AUTHOR_NAME_FIELDS)
+        return instance
+
     def __str__(self):
         return self.username
 
+def status_key(status):
+    # 'Under Review' -> 'under_review', usable as an annotation name
+    return status.lower().replace(' ', '_')
+
+
+class JobPostingQuerySet(models.QuerySet):
+    def with_applicant_counts(self):
+        # applicant_total plus applicants_<status> per STATUS_CHOICES value,
+        # summed from the JobStatusCount rollup (at most one row per status)
+        counts = {
+            f'applicants_{status_key(status)}': Coalesce(models.Sum(
+                'status_counts__count', filter=models.Q(status_counts__status=status)), 0)
+            for status in Applications.STATUS_CHOICES
+        }
+        return self.annotate(applicant_total=Coalesce(models.Sum('status_counts__count'), 0), **counts)
+
+
 # Job Posting Model
 class JobPosting(models.Model):
     JOB_SETUP_CHOICES = {
@@ -58,10 +93,82 @@ class JobPosting(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey('CustomUser', on_delete=models.CASCADE, related_name='job_postings')
 
+    objects = JobPostingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset pagination of the job feed (api/pagination.py)
+            models.Index(fields=['-created_at', '-id'], name='jobposting_feed_idx'),
+            # an employer's own postings, newest first
+            models.Index(fields=['author', '-created_at', '-id'], name='jobposting_author_feed_idx'),
+            # job list filters (api/filters.py)
+            models.Index(fields=['job_setup', 'job_type', '-created_at'], name='jobposting_setup_type_idx'),
+            models.Index(fields=['job_type', '-created_at'], name='jobposting_type_idx'),
+            models.Index(fields=['min_salary', 'max_salary'], name='jobposting_salary_idx'),
+            models.Index(Lower('job_location'), models.F('created_at').desc(), name='jobposting_location_idx'),
+            # admin company filter
+            models.Index(fields=['job_company', '-created_at'], name='jobposting_company_idx'),
+        ]
+
     def __str__(self):
         return f"{self.job_title} at {self.job_company}"
 
 
+# Precomputed username/email/name trigrams for fuzzy user search on SQLite
+# (api/search.py). PostgreSQL uses pg_trgm indexes instead.
+class UserSearchGram(models.Model):
+    user = models.ForeignKey('CustomUser', on_delete=models.CASCADE, related_name='search_grams')
+    gram = models.CharField(max_length=3)
+
+    class Meta:
+        unique_together = ('gram', 'user')
+
+
+# Normalized skill vocabulary and the user -> skill index behind candidate
+# search (api/skills.py), kept in step with CustomUser.skills
+class Skill(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    user_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return self.name
+
+
+class UserSkill(models.Model):
+    user = models.ForeignKey('CustomUser', on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='user_links')
+
+    class Meta:
+        # one skill's users, in id order, are a range of this index
+        unique_together = ('skill', 'user')
+
+
+# Full-text MATCH against an FTS5 table
+class FullTextMatch(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", lhs_params + rhs_params
+
+
+# SQLite FTS5 mirror of JobPosting text (see api/search.py). Not used on PostgreSQL.
+class JobPostingSearchIndex(models.Model):
+    job = models.OneToOneField(JobPosting, primary_key=True, db_column='rowid', db_constraint=False,
+                               on_delete=models.DO_NOTHING, related_name='search_index')
+    # FTS5 exposes the table itself as a hidden column to MATCH against
+    document = models.TextField(db_column='api_jobposting_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'api_jobposting_fts'
+
+
+JobPostingSearchIndex._meta.get_field('document').register_lookup(FullTextMatch)
+
+
 # Applications Model
 class Applications(models.Model):
     STATUS_CHOICES = {
@@ -79,8 +186,62 @@ class Applications(models.Model):
     class Meta:
 
         unique_together = ('user', 'job')
+        indexes = [
+            models.Index(fields=['user', '-date', '-id'], name='application_user_feed_idx'),
+            # admin changelist order
+            models.Index(fields=['-date', '-id'], name='application_date_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # remember the loaded status and job so post_save can move the pipeline counters
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('application_status')
+        instance._loaded_job_id = instance.__dict__.get('job_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # the row and its pipeline counters (post_save, api/signals.py) commit
+        # together; deletes already send post_delete inside their transaction
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.email} applied for {self.job.job_title}"
 
 
+# Applicant pipeline rollups, kept in step with Applications by api/stats.py
+class JobStatusCount(models.Model):
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='status_counts')
+    status = models.CharField(max_length=20, choices=Applications.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('job', 'status')
+
+
+class JobDailyApplications(models.Model):
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='daily_applications')
+    date = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('job', 'date')
+
+
+
+
+# Hashed term vector of a posting for recommendations (api/recommend.py)
+class JobVector(models.Model):
+    job = models.OneToOneField(JobPosting, primary_key=True, on_delete=models.CASCADE, related_name='vector')
+    terms = models.BinaryField()  # int32 feature numbers, ascending
+    weights = models.BinaryField()  # float32, L2-normalised
+    revision = models.BigIntegerField(db_index=True)  # time.time_ns() when written
+
+
+# Refresh tokens used up by rotation (api/blacklist.py). Rows are only needed
+# until the token would have expired anyway; purge_token_blacklist drops them.
+class BlacklistedToken(models.Model):
+    jti = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
@@ -0,0 +1,206 @@
+import base64
+import datetime
+import decimal
+import json
+from functools import reduce
+from operator import and_, or_
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def query_params(request):
+    # DRF requests and plain Django ones (the async views) alike
+    return getattr(request, 'query_params', request.GET)
+
+
+def estimate_count(queryset):
+    # Planner row estimate on PostgreSQL; other databases just count.
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor pagination that seeks on the full ordering tuple, e.g.
+    WHERE (created_at, id) < (last.created_at, last.id), so every page costs
+    the same however deep it is and new rows never shift existing pages.
+    The ordering must end in a unique column. No COUNT(*) is run unless the
+    client asks for one with ?count=exact or ?count=estimate.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, request, queryset, view):
+        if hasattr(view, 'get_cursor_ordering'):
+            return tuple(view.get_cursor_ordering())
+        return self.ordering
+
+    def get_page_size(self, request):
+        try:
+            size = int(query_params(request)[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_query = self.prepare(queryset, request, view)
+        self.count = self.get_count(queryset, request)
+        return self.finish(list(page_query))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        # async ORM version for the ASGI views (api/async_views.py)
+        page_query = self.prepare(queryset, request, view)
+        self.count = await self.aget_count(queryset, request)
+        return self.finish([row async for row in page_query])
+
+    def prepare(self, queryset, request, view):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.page_size_wanted = self.get_page_size(request)
+
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor['r'])
+        ordering = self.flip(self.ordering) if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor:
+            queryset = queryset.filter(self.seek(ordering, self.cursor_values(queryset, self.cursor['v'])))
+        return queryset[:self.page_size_wanted + 1]
+
+    def finish(self, rows):
+        has_more = len(rows) > self.page_size_wanted
+        rows = rows[:self.page_size_wanted]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        self.page = rows
+        return rows
+
+    def get_count(self, queryset, request):
+        mode = query_params(request).get(self.count_query_param)
+        if mode == 'exact':
+            return queryset.count()
+        if mode == 'estimate':
+            return estimate_count(queryset)
+        return None
+
+    async def aget_count(self, queryset, request):
+        mode = query_params(request).get(self.count_query_param)
+        if mode == 'exact':
+            return await queryset.acount()
+        if mode == 'estimate':
+            return await sync_to_async(estimate_count)(queryset)
+        return None
+
+    def get_paginated_data(self, data):
+        body = {'next': self.get_next_link(), 'previous': self.get_previous_link()}
+        if self.count is not None:
+            body['count'] = self.count
+        body['results'] = data
+        return body
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.link(self.page[0], reverse=True)
+
+    def link(self, row, reverse):
+        values = [self.encode_value(self.value_of(row, field.lstrip('-'))) for field in self.ordering]
+        token = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(token.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = query_params(request).get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            cursor = json.loads(raw)
+            if not isinstance(cursor['v'], list) or len(cursor['v']) != len(self.ordering):
+                raise ValueError
+            if cursor['r'] not in (0, 1):
+                raise ValueError
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def cursor_values(self, queryset, values):
+        # the cursor's values as their columns' types; a tampered one is a 404, not an ORM error
+        query = queryset.query.clone()
+        typed = []
+        for field, value in zip(self.ordering, values):
+            output_field = query.resolve_ref(field.lstrip('-')).output_field
+            try:
+                if value is None or isinstance(value, (list, dict)):
+                    raise ValueError
+                typed.append(output_field.to_python(value))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+        return typed
+
+    @staticmethod
+    def flip(ordering):
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    @staticmethod
+    def seek(ordering, values):
+        # Rows strictly after `values` in `ordering`, as a lexicographic OR of ANDs
+        clauses = []
+        for i, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = [Q(**{ordering[j].lstrip('-'): values[j]}) for j in range(i)]
+            clauses.append(reduce(and_, equal + [Q(**{f'{name}__{lookup}': values[i]})]))
+        return reduce(or_, clauses)
+
+    @staticmethod
+    def value_of(row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    @staticmethod
+    def encode_value(value):
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()
+        if isinstance(value, decimal.Decimal):
+            return str(value)
+        return value
+
+
+class ApplicationKeysetPagination(KeysetPagination):
+    ordering = ('-date', '-id')
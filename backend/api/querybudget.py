@@ -0,0 +1,53 @@
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    # execute_wrapper hook that just counts the statements going through it
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMixin:
+    # Max number of SQL queries one request to the view may issue, including the
+    # JWT user lookup. Either an int or a dict keyed by HTTP method.
+    query_budget = None
+
+    def get_query_budget(self, request):
+        budget = self.query_budget
+        if isinstance(budget, dict):
+            return budget.get(request.method)
+        return budget
+
+    def dispatch(self, request, *args, **kwargs):
+        budget = self.get_query_budget(request)
+        if budget is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(counter))
+            response = super().dispatch(request, *args, **kwargs)
+
+        if counter.count > budget:
+            message = "%s %s ran %d queries (budget %d) in %s" % (
+                request.method, request.path, counter.count, budget, type(self).__name__)
+            if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
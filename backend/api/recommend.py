@@ -0,0 +1,300 @@
+import threading
+import time
+import zlib
+
+import numpy as np
+from scipy import sparse
+
+from .models import JobPosting, JobVector
+from .search import TERM_RE
+
+
+# Skill-based job recommendations.
+#
+# Every posting is stored as a sparse term vector (JobVector, written by the
+# JobPosting save signal): its words and word pairs hashed into N_FEATURES
+# columns, weighted by field and log term frequency, cut to the MAX_TERMS
+# strongest and L2-normalised. Nothing about a posting is recomputed per request.
+#
+# Each process keeps every vector in one column-compressed SciPy matrix
+# (JobIndex). A user's skills, title and bio become a query vector weighted by
+# inverse document frequency, and scoring reads only the matrix columns of the
+# query's terms: a few vectorized passes, not a loop over postings. Vectors written since the matrix was
+# built are polled for on each request and kept in smaller matrices next to it.
+
+N_FEATURES = 1 << 20
+MAX_TERMS = 48
+MAX_QUERY_TERMS = 128
+JOB_FIELDS = (('job_title', 3.0), ('job_requirements', 2.0), ('job_description', 1.0))
+USER_FIELDS = (('skills', 2.0), ('user_title', 1.0), ('bio', 0.5))
+
+# freeze the overlay into a segment past this many postings
+OVERLAY_LIMIT = 2000
+# re-read vectors written this long before the last one seen, in case they
+# committed late or another server's clock is behind
+REVISION_OVERLAP_NS = 5 * 10 ** 9
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the this to was we
+will with you your able must should can plus etc years year experience work working strong
+""".split())
+
+
+def tokens(text):
+    words = [word for word in TERM_RE.findall(text.lower()) if word not in STOP_WORDS]
+    return words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+
+
+def feature(term):
+    # crc32 rather than hash(), which differs between processes
+    return zlib.crc32(term.encode()) & (N_FEATURES - 1)
+
+
+def text_vector(fields, max_terms=MAX_TERMS):
+    # [(text, weight), ...] -> (int32 features ascending, float32 L2-normalised weights)
+    counts = {}
+    for text, weight in fields:
+        for term in tokens(text or ''):
+            column = feature(term)
+            counts[column] = counts.get(column, 0.0) + weight
+    terms = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    weights = np.log1p(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    if len(terms) > max_terms:
+        keep = np.argpartition(weights, -max_terms)[-max_terms:]
+        terms, weights = terms[keep], weights[keep]
+    order = np.argsort(terms)
+    terms, weights = terms[order], weights[order]
+    if len(weights):
+        weights /= np.linalg.norm(weights)
+    return terms, weights
+
+
+def job_vector(job):
+    return text_vector([(getattr(job, field), weight) for field, weight in JOB_FIELDS])
+
+
+def user_vector(user):
+    return text_vector([(getattr(user, field), weight) for field, weight in USER_FIELDS], MAX_QUERY_TERMS)
+
+
+def store_vectors(jobs, using):
+    # Upsert the vectors of `jobs` in one query
+    vectors = []
+    for job in jobs:
+        terms, weights = job_vector(job)
+        vectors.append(JobVector(job_id=job.pk, terms=terms.tobytes(), weights=weights.tobytes(),
+                                 revision=time.time_ns()))
+    JobVector.objects.using(using).bulk_create(
+        vectors, update_conflicts=True, unique_fields=['job'], update_fields=['terms', 'weights', 'revision'])
+
+
+def decode(terms, weights):
+    return np.frombuffer(terms, dtype=np.int32), np.frombuffer(weights, dtype=np.float32)
+
+
+def stack(vectors):
+    # [(terms, weights), ...] -> CSR matrix, one row per vector
+    if not vectors:
+        return sparse.csr_matrix((0, N_FEATURES), dtype=np.float32)
+    lengths = np.fromiter((len(terms) for terms, _ in vectors), dtype=np.int64, count=len(vectors))
+    indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    indices = np.concatenate([terms for terms, _ in vectors])
+    data = np.concatenate([weights for _, weights in vectors])
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(vectors), N_FEATURES))
+
+
+def top(ids, scores, limit):
+    # The `limit` best (id, score) pairs, best first, newer postings first on ties
+    hits = np.flatnonzero(scores > 0)
+    if len(hits) > limit:
+        hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+    hits = hits[np.lexsort((-ids[hits], -scores[hits]))]
+    return [(int(ids[i]), float(scores[i])) for i in hits]
+
+
+class Segment:
+    # Posting vectors frozen into a CSC matrix, one row per job (job_ids
+    # ascending). Rows whose job changed or went away since are marked stale.
+    def __init__(self, job_ids, matrix, revisions):
+        self.job_ids = np.asarray(job_ids, dtype=np.int64)
+        self.matrix = matrix.tocsc()
+        self.revisions = np.asarray(revisions, dtype=np.int64)
+        self.stale = np.zeros(len(self.job_ids), dtype=bool)
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        # {job_id: (terms, weights, revision)}
+        job_ids = sorted(vectors)
+        return cls(job_ids, stack([vectors[job_id][:2] for job_id in job_ids]),
+                   [vectors[job_id][2] for job_id in job_ids])
+
+    def __len__(self):
+        return len(self.job_ids) - int(self.stale.sum())
+
+    def rows_of(self, job_ids):
+        # rows holding a live vector for any of `job_ids`
+        rows = np.searchsorted(self.job_ids, job_ids).clip(max=max(len(self.job_ids) - 1, 0))
+        if not len(self.job_ids):
+            return rows[:0]
+        rows = rows[self.job_ids[rows] == job_ids]
+        return rows[~self.stale[rows]]
+
+    def document_frequency(self, terms):
+        indptr = self.matrix.indptr
+        return indptr[terms + 1] - indptr[terms]
+
+    def scores(self, terms, query):
+        columns = self.matrix[:, terms]
+        contributions = columns.data * np.repeat(query, np.diff(columns.indptr))
+        scores = np.bincount(columns.indices, weights=contributions, minlength=len(self.job_ids))
+        scores[self.stale] = 0
+        return scores
+
+    def merge(self, other):
+        keep, other_keep = ~self.stale, ~other.stale
+        job_ids = np.concatenate([self.job_ids[keep], other.job_ids[other_keep]])
+        matrix = sparse.vstack([self.matrix.tocsr()[keep], other.matrix.tocsr()[other_keep]], format='csr')
+        revisions = np.concatenate([self.revisions[keep], other.revisions[other_keep]])
+        order = np.argsort(job_ids, kind='stable')
+        return Segment(job_ids[order], matrix[order], revisions[order])
+
+
+class JobIndex:
+    """
+    Posting vectors of one process, as a few Segments: the one loaded at start
+    plus ever smaller ones of later writes, and an overlay of the newest writes
+    that is re-stacked on every change. A full overlay becomes a segment and
+    segments of similar size are merged, so a write never copies the big one.
+    """
+
+    def __init__(self, segment, revision=0):
+        self.segments = [segment]
+        self.revision = revision
+        self.overlay = {}  # job_id -> (terms, weights, revision)
+        self.overlay_segment = Segment.from_vectors({})
+        self.lock = threading.Lock()
+
+    @classmethod
+    def build(cls, rows):
+        # rows: (job_id, terms, weights, revision) ordered by job_id
+        job_ids, vectors, revisions = [], [], []
+        for job_id, terms, weights, revision in rows:
+            job_ids.append(job_id)
+            vectors.append(decode(terms, weights))
+            revisions.append(revision)
+        return cls(Segment(job_ids, stack(vectors), revisions), max(revisions, default=0))
+
+    @classmethod
+    def load(cls, queryset=None):
+        queryset = JobVector.objects.all() if queryset is None else queryset
+        rows = queryset.order_by('job_id').values_list('job_id', 'terms', 'weights', 'revision')
+        return cls.build(rows.iterator(chunk_size=5000))
+
+    def __len__(self):
+        return sum(len(segment) for segment in self.segments) + len(self.overlay)
+
+    def mark_stale(self, job_ids):
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        for segment in self.segments:
+            segment.stale[segment.rows_of(job_ids)] = True
+
+    def indexed_revision(self, job_id):
+        if job_id in self.overlay:
+            return self.overlay[job_id][2]
+        for segment in self.segments:
+            rows = segment.rows_of(np.array([job_id]))
+            if len(rows):
+                return segment.revisions[rows[0]]
+        return None
+
+    def refresh(self, queryset=None):
+        # Pick up vectors other processes wrote since the last call: one indexed query
+        queryset = JobVector.objects.all() if queryset is None else queryset
+        rows = (queryset.filter(revision__gt=self.revision - REVISION_OVERLAP_NS)
+                .values_list('job_id', 'terms', 'weights', 'revision'))
+        self.update(list(rows))
+
+    def update(self, rows):
+        with self.lock:
+            changed = []
+            for job_id, terms, weights, revision in rows:
+                self.revision = max(self.revision, revision)
+                if self.indexed_revision(job_id) == revision:
+                    continue  # seen it
+                self.overlay[job_id] = decode(terms, weights) + (revision,)
+                changed.append(job_id)
+            if changed:
+                self.mark_stale(changed)
+                self.restack()
+
+    def remove(self, job_ids):
+        with self.lock:
+            self.mark_stale(job_ids)
+            for job_id in job_ids:
+                self.overlay.pop(job_id, None)
+            self.restack()
+
+    def restack(self):
+        self.overlay_segment = Segment.from_vectors(self.overlay)
+        if len(self.overlay) > OVERLAY_LIMIT:
+            self.segments.append(self.overlay_segment)
+            self.overlay, self.overlay_segment = {}, Segment.from_vectors({})
+            # merge the newest segments while they are of similar size
+            while len(self.segments) > 1 and 2 * len(self.segments[-1]) >= len(self.segments[-2]):
+                newer = self.segments.pop()
+                self.segments[-1] = self.segments[-1].merge(newer)
+
+    def score(self, terms, weights, limit, exclude=()):
+        # The `limit` best matching (job_id, score) pairs for a query vector
+        if not len(terms) or limit <= 0:
+            return []
+        with self.lock:
+            segments = self.segments + [self.overlay_segment]
+
+        # smoothed idf over everything indexed
+        df = sum(segment.document_frequency(terms) for segment in segments)
+        query = weights * (np.log((1 + sum(len(segment.job_ids) for segment in segments)) / (1 + df)) + 1)
+        query /= np.linalg.norm(query)
+
+        exclude = np.fromiter(exclude, dtype=np.int64)
+        matches = []
+        for segment in segments:
+            scores = segment.scores(terms, query)
+            if len(exclude):
+                scores[segment.rows_of(exclude)] = 0
+            matches += top(segment.job_ids, scores, limit)
+        return sorted(matches, key=lambda match: (-match[1], -match[0]))[:limit]
+
+
+# This process's index, loaded on first use
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = JobIndex.load()
+            return _index
+    _index.refresh()
+    return _index
+
+
+def forget_jobs(job_ids):
+    if _index is not None:
+        _index.remove(job_ids)
+
+
+def rebuild(using, batch_size=500):
+    # Recompute every posting's vector, e.g. after changing the weights above
+    jobs = JobPosting.objects.using(using).only('pk', *[field for field, _ in JOB_FIELDS]).order_by('pk')
+    batch = []
+    for job in jobs.iterator(chunk_size=batch_size):
+        batch.append(job)
+        if len(batch) == batch_size:
+            store_vectors(batch, using)
+            batch = []
+    if batch:
+        store_vectors(batch, using)
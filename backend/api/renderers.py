@@ -0,0 +1,38 @@
+import decimal
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # plain DRF rendering without it
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson, which serializes dicts, lists, strings and
+    datetimes in C (raw datetimes keep their microseconds). Anything orjson
+    doesn't know, such as Decimals and lazy strings, goes through DRF's
+    encoder. Indented or ASCII-only output, and a missing orjson, fall back
+    to the stock renderer.
+    """
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        ret = orjson.dumps(data, default=self.default, option=self.options)
+        # same strict-javascript escaping as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+    def default(self, obj):
+        # serializer fields have already turned Decimals into strings; raw
+        # ones become floats, as with DRF's encoder
+        if isinstance(obj, decimal.Decimal):
+            return float(obj)
+        return self.encoder_class().default(obj)
@@ -0,0 +1,89 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+# Read replicas. Writes always go to the primary ("default"); reads are spread
+# over settings.DATABASE_REPLICAS, one replica per request so a page and its
+# count agree. Reads go to the primary instead when they could miss a recent
+# write: inside a transaction, for the rest of a request that has written,
+# during unsafe (POST/PUT/PATCH/DELETE) requests, and for REPLICA_STICKY_SECONDS
+# after a client's last write (see ReplicaStickinessMiddleware).
+
+_state = ContextVar('jobfinder_db_routing', default=None)
+
+
+class RoutingState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+        self.replica = None
+
+
+def current_state():
+    return _state.get()
+
+
+@contextmanager
+def routing(pinned=False):
+    # Routing scope of one request
+    state = RoutingState(pinned)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def use_primary():
+    # Read from the primary inside this block
+    state = _state.get()
+    if state is None:
+        with routing(pinned=True):
+            yield
+        return
+    pinned = state.pinned
+    state.pinned = True
+    try:
+        yield
+    finally:
+        state.pinned = pinned
+
+
+def within_lag_window(timestamp):
+    # Whether a write at `timestamp` (epoch seconds) may not have reached the replicas yet
+    return time.time() - timestamp < settings.REPLICA_STICKY_SECONDS
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            return None
+        state = _state.get()
+        if state is not None and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if state is None:
+            return random.choice(replicas)
+        if state.replica is None:
+            state.replica = random.choice(replicas)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # replicas hold the same rows
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,213 @@
+import re
+
+from django.db import connections
+from django.db.models import Count, Expression, F, FloatField, Q, Value
+from django.db.models.functions import Cast, Concat, Greatest
+from django.utils.functional import cached_property
+
+from .models import USER_SEARCH_FIELDS, CustomUser, UserSearchGram
+
+
+# Full-text search over job postings.
+#
+# PostgreSQL: api_jobposting.search_document is a generated, GIN-indexed
+# tsvector (see migration 0005), so the database keeps it in sync itself.
+# SQLite: api_jobposting_fts is an FTS5 mirror table maintained from the
+# JobPosting save/delete signals.
+#
+# Both rank title matches above company/location, then requirements and
+# description, stem English words and treat the last term as a prefix so
+# search-as-you-type works.
+
+SEARCH_FIELDS = ('job_title', 'job_company', 'job_location', 'job_description', 'job_requirements')
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TERMS = 8
+
+
+def parse_terms(query):
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+class SearchDocument(Expression):
+    """
+    api_jobposting.search_document, the generated tsvector column that has no
+    model field, under whichever alias the query gives the table (e.g. U0
+    once the queryset is used as a subquery).
+    """
+
+    def __init__(self, alias=None):
+        super().__init__()
+        self.alias = alias
+
+    def resolve_expression(self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False):
+        return SearchDocument(query.get_initial_alias())
+
+    def relabeled_clone(self, change_map):
+        return SearchDocument(change_map.get(self.alias, self.alias))
+
+    def as_sql(self, compiler, connection):
+        return f'{compiler.quote_name_unless_alias(self.alias)}.{connection.ops.quote_name("search_document")}', []
+
+    @cached_property
+    def output_field(self):
+        from django.contrib.postgres.search import SearchVectorField
+        return SearchVectorField()
+
+
+class PostgresJobSearch:
+    def build_query(self, terms):
+        parts = [f"{term}:*" if i == len(terms) - 1 else term for i, term in enumerate(terms)]
+        return ' & '.join(parts)
+
+    def search(self, queryset, terms):
+        # needs a PostgreSQL driver, so only imported here
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(self.build_query(terms), config='english', search_type='raw')
+        return queryset.alias(search_document=SearchDocument()).filter(search_document=query).annotate(
+            # float8: a float4 rank comes back rounded, so a cursor's copy of it never equals the stored one
+            search_rank=Cast(SearchRank(F('search_document'), query, cover_density=True), FloatField())
+        )
+
+    def index(self, job, using):
+        pass  # generated column
+
+    def remove(self, job_id, using):
+        pass  # row goes with the job
+
+    def rebuild(self, using):
+        pass
+
+
+class SQLiteJobSearch:
+    table = 'api_jobposting_fts'
+
+    def build_query(self, terms):
+        parts = [f'"{term}"*' if i == len(terms) - 1 else f'"{term}"' for i, term in enumerate(terms)]
+        return ' '.join(parts)
+
+    def search(self, queryset, terms):
+        # bm25 is "lower is better"; flip it so search_rank sorts like Postgres
+        return queryset.filter(
+            search_index__document__match=self.build_query(terms)
+        ).annotate(search_rank=-F('search_index__rank'))
+
+    def index(self, job, using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [job.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, {", ".join(SEARCH_FIELDS)}) VALUES (%s, %s, %s, %s, %s, %s)',
+                [job.pk] + [getattr(job, field) for field in SEARCH_FIELDS],
+            )
+
+    def remove(self, job_id, using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [job_id])
+
+    def rebuild(self, using):
+        columns = ', '.join(SEARCH_FIELDS)
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(f'INSERT INTO {self.table} (rowid, {columns}) SELECT id, {columns} FROM api_jobposting')
+
+
+def get_backend(using='default'):
+    if connections[using].vendor == 'postgresql':
+        return PostgresJobSearch()
+    return SQLiteJobSearch()
+
+
+def search_jobs(queryset, query):
+    # Filter a JobPosting queryset to matches, best first (existing ordering
+    # breaks ties). Blank queries return the queryset unchanged.
+    terms = parse_terms(query)
+    if not terms:
+        return queryset
+    ordering = queryset.query.order_by
+    return get_backend(queryset.db).search(queryset, terms).order_by('-search_rank', *ordering)
+
+
+# Fuzzy user search over username, email and full name.
+#
+# PostgreSQL: pg_trgm similarity backed by GIN trigram indexes (migration 0009).
+# SQLite: trigrams are precomputed into api_usersearchgram by the CustomUser
+# save signal, and users are ranked by how many of the query's trigrams they share.
+
+
+def trigrams(text):
+    # pg_trgm style: lowercase words padded with two spaces in front, one behind
+    grams = set()
+    for word in TERM_RE.findall(text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class PostgresUserSearch:
+    def search(self, queryset, query, limit):
+        # needs a PostgreSQL driver, so only imported here
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        matches = Q()
+        for field in USER_SEARCH_FIELDS:
+            matches |= Q(**{f'{field}__trigram_similar': query})
+        return queryset.filter(matches).annotate(search_rank=Greatest(
+            TrigramSimilarity('username', query),
+            TrigramSimilarity('email', query),
+            TrigramSimilarity(Concat('first_name', Value(' '), 'last_name'), query),
+        )).order_by('-search_rank', 'id')[:limit]
+
+    def index(self, user, using):
+        pass  # trigram indexes are maintained by PostgreSQL
+
+    def rebuild(self, using):
+        pass
+
+
+class SQLiteUserSearch:
+    # share at least this fraction of the query's trigrams to count as a match
+    min_overlap = 0.3
+
+    def search(self, queryset, query, limit):
+        grams = trigrams(query)
+        if not grams:
+            return queryset.none()
+        needed = max(1, int(len(grams) * self.min_overlap))
+        return (queryset.filter(search_grams__gram__in=grams)
+                .annotate(search_rank=Count('search_grams'))
+                .filter(search_rank__gte=needed)
+                .order_by('-search_rank', 'id')[:limit])
+
+    def grams_for(self, user):
+        grams = set()
+        for field in USER_SEARCH_FIELDS:
+            grams |= trigrams(getattr(user, field) or '')
+        return grams
+
+    def index(self, user, using):
+        UserSearchGram.objects.using(using).filter(user_id=user.pk).delete()
+        UserSearchGram.objects.using(using).bulk_create(
+            [UserSearchGram(user_id=user.pk, gram=gram) for gram in self.grams_for(user)])
+
+    def rebuild(self, using):
+        UserSearchGram.objects.using(using).all().delete()
+        for user in CustomUser.objects.using(using).only('pk', *USER_SEARCH_FIELDS).iterator(chunk_size=500):
+            UserSearchGram.objects.using(using).bulk_create(
+                [UserSearchGram(user_id=user.pk, gram=gram) for gram in self.grams_for(user)])
+
+
+def get_user_backend(using='default'):
+    if connections[using].vendor == 'postgresql':
+        return PostgresUserSearch()
+    return SQLiteUserSearch()
+
+
+def search_users(queryset, query, limit):
+    # Exact email addresses come straight off the unique index; anything else
+    # is a ranked fuzzy match, at most `limit` rows.
+    query = query.strip()
+    if '@' in query and ' ' not in query:
+        exact = queryset.filter(email=query)[:1]
+        if exact:
+            return exact
+    return get_user_backend(queryset.db).search(queryset, query, limit)
@@ -1,5 +1,17 @@
+import decimal
+
+from django.conf import settings
+from django.db.models import CharField, Case, F, Q, Value, When
+from django.db.models.functions import Concat, Substr
+from django.utils import timezone
 from rest_framework import serializers
-from .models import JobPosting, Applications, CustomUser
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from . import blacklist
+from .authentication import CachedJWTAuthentication, forget_user
+from .models import JobPosting, Applications, CustomUser, status_key
+from .pagination import query_params
 
 class RegisterSerializer(serializers.ModelSerializer):
     class Meta:
@@ -82,10 +94,63 @@ class ForgotPasswordSerializer(serializers.Serializer):
         user = self.validated_data['user']
         user.set_password(self.validated_data['new_password'])
         user.save()
+        forget_user(user.pk)  # drop the cached copy with the old password
         return user
 
+def requested_fields(request, available):
+    # ?fields=id,job_title on a GET -> that subset of `available` (in their
+    # usual order), or None when every field was asked for
+    params = query_params(request) if request is not None else {}
+    if request is None or request.method != 'GET' or not params.get('fields'):
+        return None
+    wanted = [name.strip() for name in params['fields'].split(',') if name.strip()]
+    unknown = [name for name in wanted if name not in available]
+    if unknown:
+        raise serializers.ValidationError({'fields': f"Unknown field(s): {', '.join(unknown)}."})
+    return [name for name in available if name in wanted]
+
+
+class SparseFieldsMixin:
+    # Serializers with this mixin honour ?fields= on GET requests
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = requested_fields(self.context.get('request'), list(self.fields))
+        if wanted is not None:
+            for name in set(self.fields) - set(wanted):
+                self.fields.pop(name)
+
+
+# Card fields for ?view=summary: no long text columns, a short snippet instead
+JOB_SUMMARY_FIELDS = ('id', 'job_title', 'job_company', 'job_location', 'job_setup', 'job_type',
+                      'min_salary', 'max_salary', 'created_at', 'author', 'author_name', 'snippet')
+
+
+# Length of the description snippet in ?view=summary job cards
+SNIPPET_LENGTH = 160
+
+# One character more than the snippet, so make_snippet can tell it was cut
+SNIPPET_SOURCE = Substr('job_description', 1, SNIPPET_LENGTH + 1)
+
+
+def make_snippet(text):
+    text = ' '.join(text.split())
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    cut = text[:SNIPPET_LENGTH].rsplit(' ', 1)[0]
+    return cut.rstrip(' ,.;:') + '…'
+
+
+# SQL version of JobSerializer.get_author_name
+AUTHOR_NAME = Case(
+    When(~Q(author__first_name='') & ~Q(author__last_name=''),
+         then=Concat('author__first_name', Value(' '), 'author__last_name')),
+    default=F('author__username'),
+    output_field=CharField(),
+)
+
+
 #jobs
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author_name = serializers.SerializerMethodField()
     
     class Meta:
@@ -150,8 +215,85 @@ class JobSerializer(serializers.ModelSerializer):
             return str(value)
 
 
+#read-only fast path for job card lists: rows come from .values() with
+#author_name computed in SQL and are turned into exactly the dicts
+#JobSerializer/JobSearchSerializer would build, without model instances
+class JobCardProjection:
+    decimal_fields = ('min_salary', 'max_salary')
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        # same quantizing DRF's DecimalField does, computed once
+        self.decimals = {}
+        for name in self.decimal_fields:
+            field = JobPosting._meta.get_field(name)
+            context = decimal.getcontext().copy()
+            context.prec = field.max_digits
+            self.decimals[name] = (decimal.Decimal('.1') ** field.decimal_places, context)
+
+    @classmethod
+    def for_serializer(cls, serializer_class):
+        return cls(serializer_class.Meta.fields)
+
+    @classmethod
+    def for_request(cls, request, serializer_class):
+        # ?view=summary swaps the long text fields for a snippet and ?fields=
+        # picks columns; either way only the columns needed are selected
+        fields = serializer_class.Meta.fields
+        view = query_params(request).get('view', 'full')
+        if view == 'summary':
+            fields = [name for name in JOB_SUMMARY_FIELDS if name in fields or name == 'snippet']
+        elif view != 'full':
+            raise serializers.ValidationError({'view': 'Must be full or summary.'})
+        return cls(requested_fields(request, fields) or fields)
+
+    def values(self, queryset, extra=()):
+        # Only the requested columns are selected; extra names further keys
+        # the caller needs on each row (e.g. cursor fields)
+        computed = {'author_name': AUTHOR_NAME, 'snippet': SNIPPET_SOURCE}
+        annotations = {name: expression for name, expression in computed.items() if name in self.fields}
+        columns = ['author_id' if name == 'author' else name for name in self.fields]
+        return queryset.annotate(**annotations).values(*columns, *[name for name in extra if name not in columns])
+
+    def to_representation(self, rows):
+        # leaves the rows themselves untouched; the paginator reads them for cursors
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        sources = [(name, 'author_id' if name == 'author' else name) for name in self.fields]
+        decimals = [(name, step, context) for name, (step, context) in self.decimals.items() if name in self.fields]
+        data = []
+        for row in rows:
+            item = {name: row[source] for name, source in sources}
+            for name, step, context in decimals:
+                item[name] = '{:f}'.format(item[name].quantize(step, context=context))
+            if 'snippet' in item:
+                item['snippet'] = make_snippet(item['snippet'])
+            if 'created_at' in item:
+                created = item['created_at']
+                if tz is not None and timezone.is_aware(created):
+                    created = created.astimezone(tz)
+                created = created.isoformat()
+                item['created_at'] = created[:-6] + 'Z' if created.endswith('+00:00') else created
+            data.append(item)
+        return data
+
+
+#jobs posted by the current user, with applicant counts per status
+class MyJobSerializer(JobSerializer):
+    applicant_total = serializers.IntegerField(read_only=True)
+    applicant_counts = serializers.SerializerMethodField()
+
+    class Meta(JobSerializer.Meta):
+        fields = JobSerializer.Meta.fields + ['applicant_total', 'applicant_counts']
+
+    def get_applicant_counts(self, obj):
+        return {
+            status: getattr(obj, f'applicants_{status_key(status)}')
+            for status in Applications.STATUS_CHOICES
+        }
+
+
 #Search Engine
-class JobSearchSerializer(serializers.ModelSerializer):
+class JobSearchSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author_name = serializers.SerializerMethodField()
     
     class Meta:
@@ -194,7 +336,7 @@ class JobSearchSerializer(serializers.ModelSerializer):
 #        }
 
 #application for job
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     job_title = serializers.CharField(source='job.job_title', read_only=True)
     email = serializers.CharField(source='user.email', read_only=True)
     first_name = serializers.CharField(source='user.first_name', read_only=True)
@@ -208,6 +350,14 @@ class ApplicationSerializer(serializers.ModelSerializer):
         read_only_fields = ['email', 'first_name', 'last_name', 'application_status', 'date']
 
 
+#application with the full job card embedded (?expand=job)
+class ApplicationWithJobSerializer(ApplicationSerializer):
+    job_details = JobSerializer(source='job', read_only=True)
+
+    class Meta(ApplicationSerializer.Meta):
+        fields = ApplicationSerializer.Meta.fields + ['job_details']
+
+
 class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
     applicant = serializers.CharField(source='user.username', read_only=True)
     job_title = serializers.CharField(source='job.job_title', read_only=True)
@@ -215,3 +365,60 @@ class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Applications
         fields = ['id', 'applicant', 'job_title', 'application_status', 'date']
+
+
+# Most jobs one bulk apply may name
+MAX_BULK_APPLY_JOBS = 50
+
+
+#apply to one job, or several at once
+class ApplySerializer(serializers.Serializer):
+    job = serializers.IntegerField(min_value=1)
+
+
+class BulkApplySerializer(serializers.Serializer):
+    jobs = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False,
+                                 max_length=MAX_BULK_APPLY_JOBS)
+
+
+# Most applications one bulk status change may name
+MAX_BULK_APPLICATION_IDS = 500
+
+
+#bulk status change: explicit ids, or every application on one job (optionally only those in from_status)
+class BulkApplicationStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False,
+                                allow_empty=False, max_length=MAX_BULK_APPLICATION_IDS)
+    job = serializers.IntegerField(required=False)
+    from_status = serializers.ChoiceField(choices=Applications.STATUS_CHOICES, required=False)
+    application_status = serializers.ChoiceField(choices=Applications.STATUS_CHOICES)
+
+    def validate(self, data):
+        if ('ids' in data) == ('job' in data):
+            raise serializers.ValidationError("Provide either ids or job.")
+        if 'from_status' in data and 'job' not in data:
+            raise serializers.ValidationError({'from_status': "Only valid together with job."})
+        return data
+
+
+#token refresh: used-up refresh tokens go to api/blacklist.py, the user comes from the auth cache
+class BlacklistingTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        jti = refresh[api_settings.JTI_CLAIM]
+        tokens = blacklist.get_blacklist()
+        if tokens.is_blacklisted(jti):
+            raise TokenError("Token is blacklisted")
+        # unknown, inactive or password-changed users get a 401
+        CachedJWTAuthentication().get_user(refresh)
+
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # the insert decides between concurrent refreshes of the same token
+            if api_settings.BLACKLIST_AFTER_ROTATION and not tokens.add(jti, refresh['exp']):
+                raise TokenError("Token is blacklisted")
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
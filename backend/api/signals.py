@@ -0,0 +1,118 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import cache, recommend, search, skills, stats
+from .authentication import forget_user
+from .models import AUTHOR_NAME_FIELDS, Applications, CustomUser, JobPosting
+
+
+@receiver(post_save, sender=JobPosting)
+def index_job_posting(sender, instance, using, **kwargs):
+    search.get_backend(using).index(instance, using)
+
+
+@receiver(post_delete, sender=JobPosting)
+def unindex_job_posting(sender, instance, using, **kwargs):
+    search.get_backend(using).remove(instance.pk, using)
+
+
+@receiver(post_save, sender=JobPosting)
+def vectorize_job_posting(sender, instance, using, update_fields=None, **kwargs):
+    if update_fields and not set(update_fields) & {field for field, _ in recommend.JOB_FIELDS}:
+        return
+    recommend.store_vectors([instance], using)
+
+
+@receiver(post_delete, sender=JobPosting)
+def forget_job_vector(sender, instance, **kwargs):
+    # the row goes with the job; other processes notice when they fetch it
+    recommend.forget_jobs([instance.pk])
+
+
+@receiver(post_save, sender=JobPosting)
+@receiver(post_delete, sender=JobPosting)
+def invalidate_job_responses(sender, using, **kwargs):
+    # once committed: a request in between would cache the old rows under the new generation
+    transaction.on_commit(cache.bump_generation, using=using)
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_author_name(sender, instance, created, using, update_fields=None, raw=False, **kwargs):
+    # job cards embed author names; signups, logins and password changes leave
+    # them alone (deleting an author deletes, and so invalidates, their jobs)
+    if raw or (update_fields and not set(update_fields) & set(AUTHOR_NAME_FIELDS)):
+        return
+    values = tuple(instance.__dict__.get(field) for field in AUTHOR_NAME_FIELDS)
+    if (not created and values != getattr(instance, '_loaded_author_name', None)
+            and instance.job_postings.using(using).exists()):
+        transaction.on_commit(cache.bump_generation, using=using)
+    instance._loaded_author_name = values
+
+
+@receiver(post_save, sender=CustomUser)
+def index_user(sender, instance, created, using, update_fields=None, **kwargs):
+    if update_fields and not set(update_fields) & set(search.USER_SEARCH_FIELDS):
+        return
+    # e.g. a password reset saves every field but changes none of these
+    values = tuple(instance.__dict__.get(field) for field in search.USER_SEARCH_FIELDS)
+    if created or values != getattr(instance, '_loaded_search', None):
+        search.get_user_backend(using).index(instance, using)
+    instance._loaded_search = values
+
+
+@receiver(post_save, sender=CustomUser)
+def index_user_skills(sender, instance, created, using, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields and 'skills' not in update_fields):
+        return
+    # users not loaded from the database carry no old skills to compare with
+    loaded = '' if created else getattr(instance, '_loaded_skills', None)
+    if instance.skills != loaded:
+        skills.index_user(instance, using, created)
+    instance._loaded_skills = instance.skills
+
+
+@receiver(pre_delete, sender=CustomUser)
+def unindex_user_skills(sender, instance, using, **kwargs):
+    skills.unindex_user(instance.pk, using)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def forget_authenticated_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+@receiver(post_save, sender=Applications)
+def count_application(sender, instance, created, using, raw=False, **kwargs):
+    if raw:
+        return
+    statuses, days = Counter(), Counter()
+    new = instance.application_status
+    if created:
+        statuses[instance.job_id, new] += 1
+        days[instance.job_id, instance.date] += 1
+    else:
+        # rows not loaded from the database carry no old status or job to move from
+        old = getattr(instance, '_loaded_status', None)
+        old_job_id = getattr(instance, '_loaded_job_id', None) or instance.job_id
+        if old is not None and (old, old_job_id) != (new, instance.job_id):
+            statuses[old_job_id, old] -= 1
+            statuses[instance.job_id, new] += 1
+        if old is not None and old_job_id != instance.job_id:
+            days[old_job_id, instance.date] -= 1
+            days[instance.job_id, instance.date] += 1
+    stats.apply(using, statuses, days)
+    instance._loaded_status, instance._loaded_job_id = new, instance.job_id
+
+
+@receiver(post_delete, sender=Applications)
+def uncount_application(sender, instance, using, origin=None, **kwargs):
+    # deleting a job cascades to its rollup rows too, so there's nothing to move
+    if isinstance(origin, JobPosting) or getattr(origin, 'model', None) is JobPosting:
+        return
+    status = getattr(instance, '_loaded_status', None) or instance.application_status
+    stats.apply(using, Counter({(instance.job_id, status): -1}), Counter({(instance.job_id, instance.date): -1}),
+                create=False)
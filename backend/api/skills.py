@@ -0,0 +1,126 @@
+import heapq
+import re
+
+from django.db import connections, transaction
+from django.db.models import Exists, F, OuterRef
+
+from .models import CustomUser, Skill, UserSkill
+
+
+# Normalized skill index.
+#
+# CustomUser.skills stays free text. The CustomUser save signal parses it into
+# Skill (one row per distinct skill, with how many users have it) and
+# UserSkill (user <-> skill links, uniquely indexed on (skill, user)), so a
+# skill's users are one index range in user id order. Candidate search walks
+# those ranges: "all of" starts from the rarest skill and probes the others
+# per user, "any of" merges the ranges. Neither reads the users table until
+# the page of ids is known.
+
+SEPARATORS_RE = re.compile(r'[,;\n|•]+')
+MAX_SKILL_LENGTH = 50
+MAX_SEARCH_SKILLS = 10
+
+
+def normalize(raw):
+    # ' Machine   Learning. ' -> 'machine learning'; keeps c++, c#, .net
+    return ' '.join(raw.lower().split()).strip(' -*').rstrip('.')[:MAX_SKILL_LENGTH]
+
+
+def parse_skills(text):
+    # Free text -> normalized skill names, deduplicated, in the order given
+    names = (normalize(part) for part in SEPARATORS_RE.split(text or ''))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def link(user_id, skill_ids, using):
+    # Ids of the skills newly linked to the user; existing links stay as they are
+    connection = connections[using]
+    table = connection.ops.quote_name(UserSkill._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (user_id, skill_id) VALUES {', '.join(['(%s, %s)'] * len(skill_ids))} "
+            f"ON CONFLICT (skill_id, user_id) DO NOTHING RETURNING skill_id",
+            [value for skill_id in skill_ids for value in (user_id, skill_id)],
+        )
+        return [skill_id for skill_id, in cursor.fetchall()]
+
+
+def unlink(user_id, skill_ids, using):
+    # Ids of the skills whose links to the user were actually deleted
+    connection = connections[using]
+    table = connection.ops.quote_name(UserSkill._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE user_id = %s AND skill_id IN ({', '.join(['%s'] * len(skill_ids))}) "
+            f"RETURNING skill_id",
+            [user_id, *skill_ids],
+        )
+        return [skill_id for skill_id, in cursor.fetchall()]
+
+
+def index_user(user, using, created=False):
+    # Bring the user's UserSkill links and the Skill counts in line with user.skills.
+    # Counts only move by the links actually inserted or deleted, and saves of
+    # the same user take turns on its row, so concurrent saves can't skew them.
+    wanted = set(parse_skills(user.skills))
+    with transaction.atomic(using):
+        if created:
+            current = {}
+        else:
+            list(CustomUser.objects.using(using).select_for_update().filter(pk=user.pk).values_list('pk'))
+            current = dict(
+                UserSkill.objects.using(using).filter(user_id=user.pk).values_list('skill__name', 'skill_id'))
+        added, removed = wanted - set(current), [current[name] for name in set(current) - wanted]
+
+        if added:
+            Skill.objects.using(using).bulk_create([Skill(name=name) for name in added], ignore_conflicts=True)
+            added_ids = list(Skill.objects.using(using).filter(name__in=added).values_list('id', flat=True))
+            linked = link(user.pk, added_ids, using)
+            Skill.objects.using(using).filter(id__in=linked).update(user_count=F('user_count') + 1)
+        if removed:
+            unlinked = unlink(user.pk, removed, using)
+            Skill.objects.using(using).filter(id__in=unlinked).update(user_count=F('user_count') - 1)
+
+
+def unindex_user(user_id, using):
+    # Drop a user's skills from the counts; the links go with the user
+    skill_ids = UserSkill.objects.using(using).filter(user_id=user_id).values('skill_id')
+    Skill.objects.using(using).filter(id__in=skill_ids).update(user_count=F('user_count') - 1)
+
+
+def rebuild(using):
+    UserSkill.objects.using(using).all().delete()
+    Skill.objects.using(using).update(user_count=0)
+    for user in CustomUser.objects.using(using).exclude(skills='').only('pk', 'skills').iterator(chunk_size=500):
+        index_user(user, using)
+
+
+def candidate_ids(skills, match, after=0, limit=20):
+    """
+    Ids of users having all (match='all') or any ('any') of `skills`, a list of
+    Skill rows, ascending and greater than `after`, at most `limit` of them.
+    """
+    if not skills:
+        return []
+    links = UserSkill.objects.filter(user_id__gt=after).order_by('user_id').values_list('user_id', flat=True)
+    if match == 'all':
+        rarest, *others = sorted(skills, key=lambda skill: skill.user_count)
+        queryset = links.filter(skill_id=rarest.id)
+        for skill in others:
+            queryset = queryset.filter(Exists(UserSkill.objects.filter(skill_id=skill.id, user_id=OuterRef('user_id'))))
+        return list(queryset[:limit])
+
+    # the first `limit` ids of the union are among the first `limit` of each range
+    ranges = [list(links.filter(skill_id=skill.id)[:limit]) for skill in skills]
+    return list(dict.fromkeys(heapq.merge(*ranges)))[:limit]
+
+
+def skills_of(user_ids, skills):
+    # {user_id: [names of `skills` the user has]}
+    names = {skill.id: skill.name for skill in skills}
+    matched = {user_id: [] for user_id in user_ids}
+    links = UserSkill.objects.filter(user_id__in=user_ids, skill_id__in=names).values_list('user_id', 'skill_id')
+    for user_id, skill_id in links.order_by('user_id', 'skill_id'):
+        matched[user_id].append(names[skill_id])
+    return matched
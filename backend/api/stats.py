@@ -0,0 +1,92 @@
+from collections import Counter
+
+from django.db import connections, transaction
+from django.db.models import Count, F
+
+from .models import Applications, JobDailyApplications, JobStatusCount
+
+
+# Per-posting applicant pipeline: JobStatusCount holds applicants per
+# (job, status) and JobDailyApplications holds applications per (job, day).
+# Every change to Applications goes through apply() -- the model signals for
+# single rows, and the bulk status endpoint with its own deltas -- inside the
+# caller's transaction, so reading them never needs a COUNT ... GROUP BY
+# over Applications.
+
+
+def upsert(model, using, deltas, key):
+    # Add each delta to its rollup row, creating missing rows, in a single
+    # INSERT ... ON CONFLICT DO UPDATE (same syntax on PostgreSQL and SQLite)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    fields = [model._meta.get_field(name) for name in key]
+    columns = ', '.join(quote(field.column) for field in fields)
+    row = f"({', '.join(['%s'] * (len(fields) + 1))})"
+    params = []
+    for values, delta in deltas:
+        params += [field.get_db_prep_value(value, connection) for field, value in zip(fields, values)]
+        params.append(delta)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}, count) VALUES {', '.join([row] * len(deltas))} "
+            f"ON CONFLICT ({columns}) DO UPDATE SET count = {table}.count + EXCLUDED.count",
+            params,
+        )
+
+
+def apply(using, statuses=None, days=None, create=True):
+    # statuses: Counter of (job_id, status) -> delta; days: (job_id, date) -> delta.
+    # Deletes pass create=False so a cascade delete of the job can't leave
+    # negative orphan rows behind; they only decrement rows that exist.
+    with transaction.atomic(using=using, savepoint=False):
+        for model, deltas, key in ((JobStatusCount, statuses, ('job_id', 'status')),
+                                   (JobDailyApplications, days, ('job_id', 'date'))):
+            deltas = sorted((values, delta) for values, delta in (deltas or {}).items() if delta)
+            if not deltas:
+                continue
+            if create:
+                upsert(model, using, deltas, key)
+                continue
+            for values, delta in deltas:
+                model.objects.using(using).filter(**dict(zip(key, values))).update(count=F('count') + delta)
+
+
+def record_status_changes(using, changes, target):
+    # changes: iterable of (job_id, old_status) for rows moved to target
+    statuses = Counter()
+    for job_id, old in changes:
+        statuses[job_id, old] -= 1
+        statuses[job_id, target] += 1
+    apply(using, statuses=statuses)
+
+
+def rebuild(using='default'):
+    # Recount both rollups from Applications, e.g. after raw SQL edits
+    with transaction.atomic(using=using):
+        JobStatusCount.objects.using(using).all().delete()
+        JobDailyApplications.objects.using(using).all().delete()
+        applications = Applications.objects.using(using).order_by()
+        JobStatusCount.objects.using(using).bulk_create([
+            JobStatusCount(job_id=row['job_id'], status=row['application_status'], count=row['n'])
+            for row in applications.values('job_id', 'application_status').annotate(n=Count('id'))
+        ], batch_size=1000)
+        JobDailyApplications.objects.using(using).bulk_create([
+            JobDailyApplications(job_id=row['job_id'], date=row['date'], count=row['n'])
+            for row in applications.values('job_id', 'date').annotate(n=Count('id'))
+        ], batch_size=1000)
+
+
+def job_stats(job, since=None):
+    # Read the funnel for one posting from the rollups only
+    by_status = dict.fromkeys(Applications.STATUS_CHOICES, 0)
+    by_status.update(JobStatusCount.objects.filter(job=job).values_list('status', 'count'))
+    daily = JobDailyApplications.objects.filter(job=job, count__gt=0).order_by('date')
+    if since:
+        daily = daily.filter(date__gte=since)
+    return {
+        'job': job.pk,
+        'total': sum(by_status.values()),
+        'by_status': by_status,
+        'daily': [{'date': date, 'count': count} for date, count in daily.values_list('date', 'count')],
+    }
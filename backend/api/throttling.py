@@ -0,0 +1,101 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+from . import metrics
+
+
+# Request throttling shared by every gunicorn worker through a cache
+# (settings.THROTTLE_CACHE_ALIAS, Redis in production). Each view names a
+# scope; settings.THROTTLE_RATES gives the scope's budget, e.g. '30/min'.
+#
+# Sliding window counter: a client's requests are counted per fixed window,
+# and the estimate for the last `window` seconds is this window's count plus
+# the previous window's, weighted by how much of it still overlaps. That is
+# one atomic increment and one read per request, and two small keys per
+# client that expire on their own, however fast the client calls.
+#
+# Decisions are counted in api/metrics.py as throttle.<scope>.allowed and
+# throttle.<scope>.throttled. Throttled requests get a 429 with Retry-After.
+
+PREFIX = 'jobfinder:throttle:'
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def throttle_cache():
+    return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+def parse_rate(rate):
+    # '30/min' -> (30, 60)
+    count, period = rate.split('/')
+    return int(count), PERIODS[period]
+
+
+def incr(cache, key, timeout):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout):
+            return 1
+        return cache.incr(key)
+
+
+def hit(scope, ident, now=None):
+    """
+    Count a request by `ident` against `scope`. Returns None when it may go
+    ahead, or the seconds to wait before the next one would be let through.
+    Scopes without a rate are not throttled.
+    """
+    rate = settings.THROTTLE_RATES.get(scope)
+    if not rate:
+        return None
+    limit, window = parse_rate(rate)
+    now = time.time() if now is None else now
+    number, elapsed = divmod(now, window)
+    key = f'{PREFIX}{scope}:{ident}:'
+
+    cache = throttle_cache()
+    # kept until the window after next has used it as its previous one
+    current = incr(cache, key + str(int(number)), 2 * window + 1)
+    previous = cache.get(key + str(int(number) - 1), 0)
+    weight = 1 - elapsed / window
+    if previous * weight + current <= limit:
+        metrics.incr(f'throttle.{scope}.allowed')
+        return None
+
+    # a rejected request doesn't use up the budget
+    cache.decr(key + str(int(number)))
+    current -= 1
+    metrics.incr(f'throttle.{scope}.throttled')
+    if current < limit and previous:
+        # until the previous window's share has faded enough for one more
+        fade = window * (1 - (limit - current - 1) / previous)
+        wait = fade - elapsed
+    else:
+        # until this window is the previous one and has faded enough
+        wait = window - elapsed + window * max(0.0, 1 - (limit - 1) / max(current, 1))
+    return max(1, math.ceil(round(wait, 6)))
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Throttles a view by its `throttle_scope`, per user when authenticated and
+    per client IP otherwise.
+    """
+
+    def get_ident_key(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'user:{user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        self.retry_after = hit(getattr(view, 'throttle_scope', None), self.get_ident_key(request))
+        return self.retry_after is None
+
+    def wait(self):
+        return self.retry_after
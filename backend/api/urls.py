@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     # User authentication and profile
@@ -8,17 +8,35 @@ urlpatterns = [
     path("user/update/", views.UserProfileUpdate.as_view(), name="update_user"),
     path("user/forgot-password/", views.ForgotPassword.as_view(), name="forgot_password"),
     path("user/search/", views.SearchUserProfileView.as_view(), name="search_users"),
+    path("user/candidates/", views.CandidateSearchView.as_view(), name="candidate_search"),
     
     # Job postings
     path("jobposting/", views.JobPostingListCreate.as_view(), name="jobposting_list_create"),
+    path("jobposting/mine/", views.MyJobPostingsView.as_view(), name="my_job_postings"),
+    path("jobposting/facets/", views.JobPostingFacetView.as_view(), name="job_facets"),
+    path("jobposting/search/", views.SearchJobPostingView.as_view(), name="job_search"),
+    path("jobposting/recommended/", views.RecommendedJobsView.as_view(), name="job_recommendations"),
     path("jobposting/<int:pk>/", views.JobPostingDetail.as_view(), name="job_detail"),
+    path("jobposting/<int:pk>/stats/", views.JobPostingStatsView.as_view(), name="job_stats"),
     path("job/create/", views.JobCreateView.as_view(), name="job_create"),
     path("jobposting/update/<int:pk>/", views.JobUpdate.as_view(), name="job_update"),
     path("jobposting/delete/<int:pk>/", views.JobDelete.as_view(), name="job_delete"),
     
     # Applications
     path("applications/", views.ApplicationCreateandView.as_view(), name="applications"),
+    path("applications/bulk/", views.BulkApplyView.as_view(), name="bulk_apply"),
     path("applications/employer/", views.EmployerApplicationView.as_view(), name="employer_applications"),
+    path("applications/employer/export/", views.EmployerApplicationExportView.as_view(), name="employer_applications_export"),
     path("applications/filter/", views.FilteredApplicationView.as_view(), name="filtered_applications"),
+    path("applications/status/bulk/", views.BulkApplicationStatusView.as_view(), name="bulk_application_status"),
     path("applications/status/<int:pk>/", views.UpdateApplicationStatusView.as_view(), name="update_application_status"),
+
+    # Async (ASGI) variants of the hot read endpoints
+    path("async/jobposting/", async_views.AsyncJobPostingList.as_view(), name="async_jobposting_list"),
+    path("async/jobposting/search/", async_views.AsyncJobSearch.as_view(), name="async_job_search"),
+    path("async/jobposting/<int:pk>/", async_views.AsyncJobPostingDetail.as_view(), name="async_job_detail"),
+    path("async/applications/", async_views.AsyncApplicationList.as_view(), name="async_applications"),
+
+    # Operations
+    path("metrics/", views.MetricsView.as_view(), name="metrics"),
 ]
\ No newline at end of file
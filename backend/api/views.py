@@ -1,19 +1,92 @@
 from rest_framework.response import Response
-from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
-from rest_framework import generics, serializers, status
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from .serializers import UserSerializer, JobSerializer, ApplicationSerializer, RegisterSerializer, ForgotPasswordSerializer, ProfileSerializer, JobSearchSerializer, ApplicationStatusUpdateSerializer
-from .models import JobPosting, CustomUser, Applications
+from rest_framework.exceptions import NotAcceptable, NotFound, PermissionDenied, ValidationError
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
+from rest_framework_simplejwt import views as jwt_views
+from .serializers import UserSerializer, JobSerializer, JobCardProjection, MyJobSerializer, ApplicationSerializer, ApplicationWithJobSerializer, RegisterSerializer, ForgotPasswordSerializer, ProfileSerializer, JobSearchSerializer, BulkApplicationStatusSerializer, ApplicationStatusUpdateSerializer, ApplySerializer, BulkApplySerializer, BlacklistingTokenRefreshSerializer
+from .models import JobPosting, CustomUser, Applications, Skill
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.http import urlencode
+from rest_framework.utils.urls import replace_query_param
+from .authentication import loaded_user
+from .cache import CachedResponseMixin, current_generation
+from .exports import EXPORT_FORMATS, export_queryset
+from .filters import FILTER_PARAMS, JobPostingFilterBackend, job_facets, parse_int
+from . import applying, dbpool, metrics, recommend, skills, stats
+from .pagination import ApplicationKeysetPagination, KeysetPagination
+from .querybudget import QueryBudgetMixin
+from .throttling import SlidingWindowThrottle
+from .search import parse_terms, search_jobs, search_users
+
+
+# Most jobs ?ids= may ask for at once
+MAX_BULK_JOB_IDS = 100
+
+# ?limit= of the recommendations
+DEFAULT_RECOMMENDATIONS = 20
+MAX_RECOMMENDATIONS = 100
+
+# ?limit= of the candidate search
+DEFAULT_CANDIDATES = 20
+MAX_CANDIDATES = 100
+
+
+class JobCardListMixin:
+    # GET lists go through JobCardProjection: the same JSON as the view's
+    # serializer, built from .values() rows instead of model instances
+    def get_projection(self):
+        return JobCardProjection.for_request(self.request, self.get_serializer_class())
+
+    def list(self, request, *args, **kwargs):
+        projection = self.get_projection()
+        queryset = self.filter_queryset(self.get_queryset())
+        cursor_fields = [field.lstrip('-') for field in self.paginator.get_ordering(request, queryset, self)]
+        page = self.paginate_queryset(projection.values(queryset, extra=cursor_fields))
+        return self.get_paginated_response(projection.to_representation(page))
 
 
 # JOB CREATE AND VIEW
-class JobPostingListCreate(generics.ListCreateAPIView):
+class JobPostingListCreate(JobCardListMixin, CachedResponseMixin, QueryBudgetMixin, generics.ListCreateAPIView):
     serializer_class = JobSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    filter_backends = [JobPostingFilterBackend]
+    # GET: auth, page, optional ?count; POST: auth, insert, search index delete + insert, job vector
+    query_budget = {'GET': 3, 'POST': 5}
 
     def get_queryset(self):
-        return JobPosting.objects.all().order_by('-created_at')
+        return JobPosting.objects.select_related('author').order_by('-created_at', '-id')
+
+    def list(self, request, *args, **kwargs):
+        if 'ids' in request.query_params:
+            return self.list_by_ids(request.query_params['ids'])
+        return super().list(request, *args, **kwargs)
+
+    def list_by_ids(self, raw_ids):
+        # ?ids=1,2,3 -> those jobs in one query, in the order asked for
+        try:
+            ids = list(dict.fromkeys(int(value) for value in raw_ids.split(',') if value.strip()))
+        except ValueError:
+            raise ValidationError({'ids': 'Must be a comma-separated list of job ids.'})
+        if not ids:
+            raise ValidationError({'ids': 'At least one job id is required.'})
+        if len(ids) > MAX_BULK_JOB_IDS:
+            raise ValidationError({'ids': f'At most {MAX_BULK_JOB_IDS} job ids per request.'})
+
+        projection = self.get_projection()
+        jobs = {row['id']: row for row in projection.values(JobPosting.objects.filter(pk__in=ids), extra=['id'])}
+        found = [jobs[pk] for pk in ids if pk in jobs]
+        return Response({
+            'results': projection.to_representation(found),
+            'missing': [pk for pk in ids if pk not in jobs],
+        })
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
@@ -32,37 +105,128 @@ class JobPostingListCreate(generics.ListCreateAPIView):
         }, status=status.HTTP_201_CREATED)
 
 
+# Facet counts for the job list filters
+class JobPostingFacetView(QueryBudgetMixin, generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    filter_backends = [JobPostingFilterBackend]
+    query_budget = 2
+
+    def get_queryset(self):
+        return JobPosting.objects.all()
+
+    def get(self, request, *args, **kwargs):
+        params = sorted((name, request.query_params[name]) for name in FILTER_PARAMS if request.query_params.get(name))
+        key = f'jobfacets:{current_generation()}:' + urlencode(params)
+        facets = cache.get(key)
+        if facets is None:
+            facets = job_facets(self.filter_queryset(self.get_queryset()))
+            cache.set(key, facets, settings.FACET_CACHE_TIMEOUT)
+        return Response(facets)
+
+
+# Jobs posted by the current user, with applicant counts per status
+class MyJobPostingsView(QueryBudgetMixin, generics.ListAPIView):
+    serializer_class = MyJobSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    query_budget = 3
+
+    def get_queryset(self):
+        return (JobPosting.objects.filter(author=self.request.user)
+                .select_related('author')
+                .with_applicant_counts())
+
+
+# Applicant funnel for one of the current user's postings, read from the rollups
+class JobPostingStatsView(QueryBudgetMixin, generics.RetrieveAPIView):
+    permission_classes = [IsAuthenticated]
+    query_budget = 4  # auth, job, status counts, daily counts
+
+    def get_queryset(self):
+        return JobPosting.objects.filter(author=self.request.user).only('id')
+
+    def retrieve(self, request, *args, **kwargs):
+        since = request.query_params.get('since')
+        if since:
+            since = parse_date(since)
+            if since is None:
+                raise ValidationError({'since': 'Must be an ISO date.'})
+        return Response(stats.job_stats(self.get_object(), since=since))
+
+
+# Jobs ranked against the current user's skills, title and bio
+class RecommendedJobsView(QueryBudgetMixin, generics.GenericAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+    query_budget = 4  # the user's profile, newly written vectors, jobs applied to, the postings
+
+    def get(self, request, *args, **kwargs):
+        limit = parse_int(request.query_params, 'limit')
+        if limit is None:
+            limit = DEFAULT_RECOMMENDATIONS
+        elif not 1 <= limit <= MAX_RECOMMENDATIONS:
+            raise ValidationError({'limit': f'Must be between 1 and {MAX_RECOMMENDATIONS}.'})
+        projection = JobCardProjection.for_request(request, self.get_serializer_class())
+        terms, weights = recommend.user_vector(loaded_user(request.user))
+        if not len(terms):
+            return Response({'results': []})
+
+        index = recommend.get_index()
+        applied = Applications.objects.filter(user=request.user).values_list('job_id', flat=True)
+        # extra candidates stand in for the user's own postings and any deleted
+        # since this process last heard
+        matches = index.score(terms, weights, limit * 2, exclude=set(applied))
+        queryset = JobPosting.objects.filter(pk__in=[job_id for job_id, _ in matches])
+        rows = {row['id']: row for row in projection.values(queryset, extra=['id', 'author_id'])}
+        missing = [job_id for job_id, _ in matches if job_id not in rows]
+        if missing:
+            index.remove(missing)
+
+        found = [(rows[job_id], score) for job_id, score in matches
+                 if job_id in rows and rows[job_id]['author_id'] != request.user.pk][:limit]
+        results = projection.to_representation([row for row, _ in found])
+        for item, (_, score) in zip(results, found):
+            item['match_score'] = round(score, 4)
+        return Response({'results': results})
+
+
 # JOB DETAIL VIEW - Added this new view
-class JobPostingDetail(generics.RetrieveAPIView):
+class JobPostingDetail(CachedResponseMixin, QueryBudgetMixin, generics.RetrieveAPIView):
     serializer_class = JobSerializer
     permission_classes = [AllowAny]  # Allow anyone to view job details
-    queryset = JobPosting.objects.all()
+    queryset = JobPosting.objects.select_related('author')
+    query_budget = 2
 
 
 #JOB POSTING UPDATE API
-class JobUpdate(generics.RetrieveUpdateAPIView):
+class JobUpdate(QueryBudgetMixin, generics.RetrieveUpdateAPIView):
     serializer_class = JobSerializer
     permission_classes = [IsAuthenticated]
+    # writes: auth, job, update, search index delete + insert, job vector
+    query_budget = {'GET': 2, 'PUT': 6, 'PATCH': 6}
 
     def get_queryset(self):
-        return JobPosting.objects.filter(author=self.request.user)
+        return JobPosting.objects.select_related('author').filter(author=self.request.user)
 
     def perform_update(self, serializer):
         serializer.save(author=self.request.user)
 
 
 #Job post Create
-class JobCreateView(generics.CreateAPIView):
+class JobCreateView(QueryBudgetMixin, generics.CreateAPIView):
     serializer_class = JobSerializer
     permission_classes = [IsAuthenticated]  # Only authenticated users can access
+    query_budget = 5  # auth, insert, search index delete + insert, job vector
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
 # Job delete view
-class JobDelete(generics.DestroyAPIView):
+class JobDelete(QueryBudgetMixin, generics.DestroyAPIView):
     serializer_class = JobSerializer
     permission_classes = [IsAuthenticated]
+    # auth, job, its applications, 2 rollups, job vector, applications, job, search index row
+    query_budget = 9
 
     def get_queryset(self):
         user = self.request.user
@@ -76,11 +240,26 @@ class JobDelete(generics.DestroyAPIView):
         instance.delete()
 
 
+# JWT login and refresh, throttled per client
+class LoginView(jwt_views.TokenObtainPairView):
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'login'
+
+
+class TokenRefreshView(jwt_views.TokenRefreshView):
+    throttle_classes = [SlidingWindowThrottle]
+    serializer_class = BlacklistingTokenRefreshSerializer
+    throttle_scope = 'token_refresh'
+
+
 # User registration view
-class CreateUserView(generics.CreateAPIView):
+class CreateUserView(QueryBudgetMixin, generics.CreateAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = RegisterSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'register'
+    query_budget = 12  # 2 uniqueness checks, insert, search grams, skill index (+ savepoints)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -104,21 +283,25 @@ class CreateUserView(generics.CreateAPIView):
 
 
 # User profile info view
-class UserProfileView(generics.RetrieveUpdateAPIView):
+class UserProfileView(QueryBudgetMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    query_budget = 2
 
     def get_object(self):
-        return self.request.user
+        return loaded_user(self.request.user)
 
 
 #User update info
-class UserProfileUpdate(generics.RetrieveUpdateAPIView):
+class UserProfileUpdate(QueryBudgetMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    # PUT/PATCH: auth, update, whether a renamed user authors jobs, search grams,
+    # skill index when the skills change (+ savepoints)
+    query_budget = {'GET': 2, 'PUT': 15, 'PATCH': 15}
 
     def get_object(self):
-        return self.request.user
+        return loaded_user(self.request.user)
 
     def perform_update(self, serializer):
         serializer.save()
@@ -133,9 +316,12 @@ class UserProfileUpdate(generics.RetrieveUpdateAPIView):
 """
 
 #Forget Password
-class ForgotPassword(generics.GenericAPIView):
+class ForgotPassword(QueryBudgetMixin, generics.GenericAPIView):
     serializer_class = ForgotPasswordSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'password_reset'
+    query_budget = 2
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -147,9 +333,21 @@ class ForgotPassword(generics.GenericAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 #Search for user profile
-class SearchUserProfileView(generics.ListAPIView):
+class SearchUserProfileView(QueryBudgetMixin, generics.ListAPIView):
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'user_search'
+    query_budget = 3  # auth, exact email, fuzzy fallback
+    default_limit = 10
+    max_limit = 50
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+        return max(1, min(limit, self.max_limit))
 
     def get_queryset(self):
         query = self.request.query_params.get('q', '').strip()
@@ -157,78 +355,197 @@ class SearchUserProfileView(generics.ListAPIView):
         if not query:
             raise NotFound("Search query cannot be empty.")
 
-        # Step 1: Get all users matching username or email
-        results = CustomUser.objects.filter(
-            Q(username__icontains=query) | Q(email__icontains=query)
-        )
+        results = CustomUser.objects.all()
 
-        # Step 2: Apply role logic
+        # Apply role logic
         user = self.request.user
         if user.role.lower() != 'admin':
             # regular users: exclude admins and themselves
             results = results.filter(role__iexact='user').exclude(id=user.id)
 
-        if not results.exists():
+        # Exact email, or ranked fuzzy match on username/email/name
+        return search_users(results, query, self.get_limit())
+
+    def list(self, request, *args, **kwargs):
+        users = list(self.get_queryset())
+        if not users:
             raise NotFound("User not found.")
+        return Response({'results': self.get_serializer(users, many=True).data})
+
+
+# Users having all (?match=all, the default) or any (?match=any) of ?skills=,
+# in id order, paged with ?after=<id> (the `next` link)
+class CandidateSearchView(QueryBudgetMixin, generics.GenericAPIView):
+    serializer_class = ProfileSerializer
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'user_search'
+    # auth, skills, one index range per skill (a single one for match=all), matched skills, the users
+    query_budget = 4 + skills.MAX_SEARCH_SKILLS
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        names = skills.parse_skills(params.get('skills', ''))
+        if not names:
+            raise ValidationError({'skills': 'Name at least one skill.'})
+        if len(names) > skills.MAX_SEARCH_SKILLS:
+            raise ValidationError({'skills': f'At most {skills.MAX_SEARCH_SKILLS} skills.'})
+        match = params.get('match', 'all')
+        if match not in ('all', 'any'):
+            raise ValidationError({'match': 'Must be "all" or "any".'})
+        limit = parse_int(params, 'limit')
+        if limit is None:
+            limit = DEFAULT_CANDIDATES
+        elif not 1 <= limit <= MAX_CANDIDATES:
+            raise ValidationError({'limit': f'Must be between 1 and {MAX_CANDIDATES}.'})
+        after = parse_int(params, 'after') or 0
+
+        known = list(Skill.objects.filter(name__in=names))
+        if match == 'all' and len(known) < len(names):
+            return Response({'next': None, 'results': []})  # nobody has a skill nobody has
+
+        # one extra id tells whether there is a next page
+        ids = skills.candidate_ids(known, match, after, limit + 1)
+        ids, more = ids[:limit], len(ids) > limit
+        users = CustomUser.objects.filter(id__in=ids)
+        if request.user.role.lower() != 'admin':
+            # as in the profile search; such users leave a gap in the page
+            users = users.filter(role__iexact='user').exclude(id=request.user.id)
+        users = sorted(users, key=lambda user: user.id)
+        matched = skills.skills_of([user.id for user in users], known) if match == 'any' and len(known) > 1 else None
+
+        results = self.get_serializer(users, many=True).data
+        for user, item in zip(users, results):
+            item['id'] = user.id
+            item['matched_skills'] = matched[user.id] if matched is not None else [skill.name for skill in known]
+        next_link = replace_query_param(request.build_absolute_uri(), 'after', ids[-1]) if more else None
+        return Response({'next': next_link, 'results': results})
+
+
+# ?expand=job embeds each application's full job card, joined in the same query
+class ExpandJobMixin:
+    def expand_job(self):
+        return 'job' in self.request.query_params.get('expand', '').split(',')
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and self.expand_job():
+            return ApplicationWithJobSerializer
+        return super().get_serializer_class()
 
-        return results
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.expand_job():
+            queryset = queryset.select_related('job__author')
+        return queryset
 
 
 #Application View and create
-class ApplicationCreateandView(generics.ListCreateAPIView):
+class ApplicationCreateandView(ExpandJobMixin, QueryBudgetMixin, generics.ListCreateAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ApplicationKeysetPagination
+    query_budget = {'GET': 3, 'POST': 6}  # POST: auth, insert, 2 counters, reason if rejected (+ savepoints)
+    queryset = Applications.objects.select_related('job', 'user')
 
     def get_queryset(self):
         # Only return the authenticated user's applications
-        return Applications.objects.filter(user=self.request.user)
+        return super().get_queryset().filter(user=self.request.user)
 
-    def perform_create(self, serializer):
-        user = self.request.user
-        job = serializer.validated_data['job']
-
-        # ✅ Check 1: Prevent duplicate applications
-        if Applications.objects.filter(user=user, job=job).exists():
-            raise serializers.ValidationError("You have already applied to this job.")
-
-        # ✅ Check 2: Prevent applying to own job post
-        if job.author == user:  # 'author' must exist in your JobPosting model
-            raise serializers.ValidationError("You cannot apply to your own job posting.")
+    def create(self, request, *args, **kwargs):
+        serializer = ApplySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job_id = serializer.validated_data['job']
+
+        # duplicate and own-posting checks happen inside the insert itself
+        results, created = applying.submit(request.user, [job_id])
+        result = results[job_id]
+        if result == applying.NOT_FOUND:
+            raise ValidationError({'job': [f'Invalid pk "{job_id}" - object does not exist.']})
+        if result == applying.OWN_JOB:
+            raise ValidationError("You cannot apply to your own job posting.")
+        if result == applying.DUPLICATE:
+            raise ValidationError("You have already applied to this job.")
+        return Response(self.get_serializer(created[0]).data, status=status.HTTP_201_CREATED)
+
+
+class BulkApplyView(QueryBudgetMixin, generics.GenericAPIView):
+    """
+    Applies the current user to several jobs at once:
+
+        {"jobs": [3, 7, 9]}
+
+    All of them go in with one INSERT, and each job comes back as applied
+    (with the new application), duplicate, own_job or not_found.
+    """
+    serializer_class = BulkApplySerializer
+    permission_classes = [IsAuthenticated]
+    query_budget = 6  # auth, insert, 2 counters, reasons for rejected jobs (+ savepoints)
 
-        # ✅ Save the application
-        serializer.save(user=user)
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results, created = applying.submit(request.user, serializer.validated_data['jobs'])
+        applications = dict(zip([application.job_id for application in created],
+                                ApplicationSerializer(created, many=True, context=self.get_serializer_context()).data))
+        return Response({
+            'applied': len(created),
+            'results': [{'job': job_id, 'result': result, 'application': applications.get(job_id)}
+                        for job_id, result in results.items()],
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
 #Application view for the job poster
-class EmployerApplicationView(generics.ListAPIView):
+class EmployerApplicationView(QueryBudgetMixin, generics.ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ApplicationKeysetPagination
+    query_budget = 3
 
     def get_queryset(self):
-        return Applications.objects.filter(job__author=self.request.user)
+        return Applications.objects.select_related('job', 'user').filter(job__author=self.request.user)
     
 
-class UpdateApplicationStatusView(generics.UpdateAPIView):
-    serializer_class = ApplicationStatusUpdateSerializer
-    permission_classes = [IsAuthenticated]
-    queryset = Applications.objects.all()
+class AnyAcceptContentNegotiation(DefaultContentNegotiation):
+    # For views that answer with their own content type (e.g. text/csv), so an
+    # Accept header naming it doesn't fail negotiation; errors still render as JSON
+    def select_renderer(self, request, renderers, format_suffix=None):
+        try:
+            return super().select_renderer(request, renderers, format_suffix)
+        except NotAcceptable:
+            return renderers[0], renderers[0].media_type
 
-    def get_object(self):
-        application = super().get_object()
 
-        if application.job.author != self.request.user:
-            raise PermissionDenied("You are not allowed to modify this application.")
+#Streaming export of the job poster's applicants: ?output=csv|ndjson&job=&status=
+class EmployerApplicationExportView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = AnyAcceptContentNegotiation
+
+    def get(self, request, *args, **kwargs):
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({'output': f"Must be one of: {', '.join(EXPORT_FORMATS)}."})
+        status_filter = request.query_params.get('status')
+        if status_filter and status_filter not in Applications.STATUS_CHOICES:
+            raise ValidationError({'status': 'Invalid status.'})
+        queryset = export_queryset(request.user, job=parse_int(request.query_params, 'job'), status=status_filter)
 
-        return application    
+        content_type, stream = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(stream(queryset), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="applicants-{timezone.localdate()}.{output}"'
+        response['Cache-Control'] = 'no-store'
+        return response
 
 
 #Filter of application
-class FilteredApplicationView(generics.ListAPIView):
+class FilteredApplicationView(ExpandJobMixin, QueryBudgetMixin, generics.ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ApplicationKeysetPagination
+    query_budget = 3
+    queryset = Applications.objects.select_related('job', 'user')
 
     def get_queryset(self):
         status = self.request.query_params.get('status')
-        queryset = Applications.objects.filter(user=self.request.user)
+        queryset = super().get_queryset().filter(user=self.request.user)
 
         if status:
             queryset = queryset.filter(application_status=status)
@@ -236,27 +553,110 @@ class FilteredApplicationView(generics.ListAPIView):
 
 
 #Application Status    
-class UpdateApplicationStatusView(generics.UpdateAPIView):
-    queryset = Applications.objects.all()
-    serializer_class = ApplicationSerializer
+class UpdateApplicationStatusView(QueryBudgetMixin, generics.UpdateAPIView):
+    queryset = Applications.objects.select_related('job', 'user')
+    serializer_class = ApplicationStatusUpdateSerializer  # only the status is writable
     permission_classes = [IsAuthenticated]
+    query_budget = 6  # auth, application + job, update, counters (+ savepoints)
 
-    def perform_update(self, serializer):
-        application = self.get_object()
-        if application.job.author != self.request.user:
+    def get_object(self):
+        application = super().get_object()
+        if application.job.author_id != self.request.user.id:
             raise PermissionDenied('Not authorized.')
+        return application
 
+    def perform_update(self, serializer):
         new_status = self.request.data.get('application_status')
         if new_status not in dict(Applications.STATUS_CHOICES):
             raise ValidationError({'detail': 'Invalid status.'})
+        serializer.save(application_status=new_status)  # row and counters in one transaction
+
+
+class BulkApplicationStatusView(QueryBudgetMixin, generics.GenericAPIView):
+    """
+    Moves many applications to one status:
+
+        {"ids": [1, 2, 3], "application_status": "Rejected"}
+        {"job": 7, "from_status": "Under Review", "application_status": "Interview"}
 
-        serializer.save(application_status=new_status)    
+    Ownership is checked for every row with one join, the change is a single
+    UPDATE in a transaction, and each id comes back as updated, unchanged,
+    forbidden or not_found.
+    """
+    serializer_class = BulkApplicationStatusSerializer
+    permission_classes = [IsAuthenticated]
+    query_budget = 6  # auth, ownership select, update, counters (+ savepoints)
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        target = data['application_status']
+
+        if 'ids' in data:
+            wanted = list(dict.fromkeys(data['ids']))
+            rows = Applications.objects.filter(pk__in=wanted)
+        else:
+            rows = Applications.objects.filter(job_id=data['job'], job__author=request.user)
+            if 'from_status' in data:
+                rows = rows.filter(application_status=data['from_status'])
+
+        with transaction.atomic():
+            found = {
+                pk: (author_id, current, job_id)
+                for pk, author_id, current, job_id in rows.select_for_update(of=('self',))
+                .values_list('pk', 'job__author_id', 'application_status', 'job_id')
+            }
+            if 'job' in data:
+                wanted = sorted(found)
+
+            results = {}
+            changing = []
+            for pk in wanted:
+                if pk not in found:
+                    results[pk] = 'not_found'
+                elif found[pk][0] != request.user.id:
+                    results[pk] = 'forbidden'
+                elif found[pk][1] == target:
+                    results[pk] = 'unchanged'
+                else:
+                    results[pk] = 'updated'
+                    changing.append(pk)
+            if changing:
+                Applications.objects.filter(pk__in=changing).update(application_status=target)
+                # .update() sends no signals, so move the pipeline counters here
+                stats.record_status_changes('default', [(found[pk][2], found[pk][1]) for pk in changing], target)
+
+        return Response({
+            'application_status': target,
+            'updated': len(changing),
+            'results': [{'id': pk, 'result': result} for pk, result in results.items()],
+        })
 
 #Search engine
-class SearchJobPostingView(generics.ListAPIView):
+class SearchJobPostingView(JobCardListMixin, CachedResponseMixin, QueryBudgetMixin, generics.ListAPIView):
     serializer_class = JobSearchSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'job_search'
+    pagination_class = KeysetPagination
+    query_budget = 3
 
     def get_queryset(self):
         query = self.request.query_params.get('q', '')
-        return JobPosting.objects.filter(job_title__icontains=query).order_by('-created_at')
\ No newline at end of file
+        return search_jobs(JobPosting.objects.select_related('author').order_by('-created_at', '-id'), query)
+
+    def get_cursor_ordering(self):
+        # Best match first when searching, newest first otherwise
+        if parse_terms(self.request.query_params.get('q', '')):
+            return ('-search_rank', '-created_at', '-id')
+        return KeysetPagination.ordering
+
+#Cache, throttle and pool counters for tuning
+class MetricsView(generics.GenericAPIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        data = metrics.snapshot()
+        data.update(dbpool.pool_metrics())  # this worker's pool only
+        return Response(data)
@@ -0,0 +1,13 @@
+# Picked up automatically by gunicorn when started from this directory.
+
+
+def pre_fork(server, worker):
+    # With --preload the master has imported Django and may have connected
+    # (or opened a connection pool). Close all of it before forking so each
+    # worker opens its own connections instead of sharing the master's sockets.
+    from django.apps import apps
+
+    if apps.ready:
+        from api.dbpool import close_connections
+
+        close_connections()
@@ -194,6 +194,14 @@ export const authAPI = {
     })
   },
 
+  // Users with all (match "all") or any (match "any") of the skills, by id;
+  // `after` is the last id of the previous page, as in the response's `next` link
+  searchCandidates: async (skills, { match = "all", limit = 20, after } = {}) => {
+    const params = new URLSearchParams({ skills: skills.join(","), match, limit })
+    if (after) params.set("after", after)
+    return await apiRequest(`/user/candidates/?${params}`)
+  },
+
   // Forgot password
   forgotPassword: async (username, email, newPassword) => {
     return await apiRequest("/user/forgot-password/", {
@@ -237,9 +245,44 @@ export const authAPI = {
 
 // Job API functions
 export const jobAPI = {
-  // Get all jobs
-  getAllJobs: async () => {
-    return await apiRequest("/jobposting/")
+  // Get jobs, optionally filtered server-side (job_setup, job_type, salary_min,
+  // salary_max, location, posted_after, posted_before, author)
+  getAllJobs: async (filters = {}) => {
+    const params = new URLSearchParams()
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== "") {
+        params.append(key, value)
+      }
+    })
+    const query = params.toString()
+    return await apiRequest(`/jobposting/${query ? `?${query}` : ""}`)
+  },
+
+  // Several jobs in one request (at most 100 ids)
+  getJobsByIds: async (ids) => {
+    return await apiRequest(`/jobposting/?ids=${ids.map(encodeURIComponent).join(",")}`)
+  },
+
+  // Jobs posted by the current user, with applicant counts per status
+  getMyJobs: async () => {
+    return await apiRequest("/jobposting/mine/")
+  },
+
+  // Applicant funnel for one of my postings; since is an optional YYYY-MM-DD
+  getJobStats: async (jobId, since) => {
+    const query = since ? `?since=${encodeURIComponent(since)}` : ""
+    return await apiRequest(`/jobposting/${jobId}/stats/${query}`)
+  },
+
+  // Jobs ranked against my skills, title and bio (at most 100)
+  getRecommendedJobs: async (limit = 20) => {
+    return await apiRequest(`/jobposting/recommended/?limit=${limit}`)
+  },
+
+  // Facet counts for the job filters
+  getJobFacets: async (filters = {}) => {
+    const query = new URLSearchParams(filters).toString()
+    return await apiRequest(`/jobposting/facets/${query ? `?${query}` : ""}`)
   },
 
   // Create new job - Fixed to work with JobSerializer
@@ -294,15 +337,16 @@ export const jobAPI = {
 
   // Search jobs
   searchJobs: async (query) => {
-    return await apiRequest(`/jobs/search/?q=${encodeURIComponent(query)}`)
+    return await apiRequest(`/jobposting/search/?q=${encodeURIComponent(query)}`)
   },
 }
 
 // Application API functions
 export const applicationAPI = {
-  // Get user's applications
-  getUserApplications: async () => {
-    return await apiRequest("/applications/")
+  // Get user's applications; pass { expand: "job" } to embed the job cards
+  getUserApplications: async (params = {}) => {
+    const query = new URLSearchParams(params).toString()
+    return await apiRequest(`/applications/${query ? `?${query}` : ""}`)
   },
 
   // Apply for job
@@ -315,6 +359,16 @@ export const applicationAPI = {
     })
   },
 
+  // Apply for several jobs at once; each job comes back as applied, duplicate, own_job or not_found
+  applyForJobs: async (jobIds) => {
+    return await apiRequest("/applications/bulk/", {
+      method: "POST",
+      body: JSON.stringify({
+        jobs: jobIds,
+      }),
+    })
+  },
+
   // Get applications for employer - FIXED ENDPOINT
   getEmployerApplications: async () => {
     return await apiRequest("/applications/employer/")
@@ -330,6 +384,17 @@ export const applicationAPI = {
     })
   },
 
+  // Move many applications to one status; pass { ids } or { job, from_status }
+  bulkUpdateApplicationStatus: async (selection, status) => {
+    return await apiRequest("/applications/status/bulk/", {
+      method: "POST",
+      body: JSON.stringify({
+        ...selection,
+        application_status: status,
+      }),
+    })
+  },
+
   // Filter applications
   getFilteredApplications: async (status) => {
     const query = status ? `?status=${encodeURIComponent(status)}` : ""
@@ -2,8 +2,7 @@
 
 import { useState, useEffect } from "react"
 import { useTheme } from "../App"
-import { applicationAPI } from "../api/auth"
-import api from "../api"
+import { applicationAPI, jobAPI } from "../api/auth"
 import JobDetailsModal from "./JobDetailsModal"
 
 function ApplicationsContent() {
@@ -93,39 +92,6 @@ function ApplicationsContent() {
     accent: "#3b82f6",
   }
 
-  // Try multiple API endpoints to find the correct one for job details
-  const tryFetchJobDetails = async (jobId) => {
-    const possibleEndpoints = [
-      `/api/jobs/${jobId}/`,
-      `/api/job/${jobId}/`,
-      `/api/jobposting/${jobId}/`,
-      `/api/jobpostings/${jobId}/`,
-      `/jobs/${jobId}/`,
-      `/job/${jobId}/`,
-      `/jobposting/${jobId}/`,
-      `/jobpostings/${jobId}/`,
-    ]
-
-    for (const endpoint of possibleEndpoints) {
-      try {
-        console.log(`Trying endpoint: ${endpoint}`)
-        const response = await api.get(endpoint)
-        console.log(`SUCCESS: Job details from ${endpoint}:`, response.data)
-        return { success: true, data: response.data, endpoint }
-      } catch (error) {
-        console.log(`FAILED: ${endpoint} - Status: ${error.response?.status}, Message: ${error.message}`)
-        // Continue to next endpoint
-      }
-    }
-
-    // If all endpoints fail, return failure info
-    return {
-      success: false,
-      error: `All endpoints failed for job ID ${jobId}`,
-      endpoints: possibleEndpoints,
-    }
-  }
-
   // NEW CODE - Fetch applications with job details included
   useEffect(() => {
     const fetchApplicationsWithJobDetails = async () => {
@@ -136,56 +102,38 @@ function ApplicationsContent() {
 
         console.log("Fetching user applications with job details...")
 
-        // Try to get applications with expanded job details
-        const response = await applicationAPI.getUserApplications()
+        // Job cards come embedded in the same response (?expand=job)
+        const response = await applicationAPI.getUserApplications({ expand: "job" })
         console.log("Applications response:", response)
 
         // Handle both paginated and direct array responses
         const applicationsData = response.results || response
 
         if (Array.isArray(applicationsData)) {
-          console.log("Raw applications data:", applicationsData)
-
-          // If job details are not included, we need to fetch them separately
-          if (applicationsData.length > 0 && typeof applicationsData[0].job === "number") {
-            console.log("Job details not included, trying to fetch separately...")
-
-            // Extract unique job IDs
-            const jobIds = [...new Set(applicationsData.map((app) => app.job).filter(Boolean))]
-            console.log("Unique job IDs to fetch:", jobIds)
-
-            const jobDetailsMap = {}
-            const errors = []
-
-            // Try to fetch job details for each unique job ID
-            for (const jobId of jobIds) {
-              const result = await tryFetchJobDetails(jobId)
-
-              if (result.success) {
-                jobDetailsMap[jobId] = result.data
-                console.log(`✅ Successfully fetched job ${jobId} from ${result.endpoint}`)
-              } else {
-                jobDetailsMap[jobId] = null
-                errors.push({
-                  jobId,
-                  error: result.error,
-                  endpoints: result.endpoints,
-                })
-                console.error(`❌ Failed to fetch job ${jobId}:`, result.error)
-              }
+          const jobDetailsMap = {}
+          const missingJobIds = []
+          applicationsData.forEach((app) => {
+            if (app.job_details) {
+              jobDetailsMap[app.job] = app.job_details
+            } else if (app.job) {
+              missingJobIds.push(app.job)
             }
+          })
 
-            console.log("Final job details map:", jobDetailsMap)
-            console.log("API errors:", errors)
-
-            setJobDetails(jobDetailsMap)
-            setApiErrors(errors)
-          } else {
-            console.log("Job details appear to be included in the response")
-            // Job details are already included, no need to fetch separately
-            setJobDetails({})
+          // Older responses without embedded jobs: fetch them all in one request
+          if (missingJobIds.length > 0) {
+            try {
+              const bulk = await jobAPI.getJobsByIds(missingJobIds)
+              bulk.results.forEach((job) => {
+                jobDetailsMap[job.id] = job
+              })
+            } catch (bulkError) {
+              console.error("Failed to fetch job details:", bulkError)
+              setApiErrors([{ jobIds: missingJobIds, error: bulkError.message }])
+            }
           }
 
+          setJobDetails(jobDetailsMap)
           setApplications(applicationsData)
         } else {
           console.error("Invalid applications data format:", response)
@@ -33,13 +33,9 @@ function DashboardContent({ user, onJobsUpdate }) {
 
       console.log("Fetching jobs for user:", user?.id)
 
-      // Get all jobs using the correct API
-      const response = await jobAPI.getAllJobs()
-      console.log("All jobs response:", response)
-
-      // Filter jobs posted by current user
-      const allJobs = response.results || response
-      const userJobs = allJobs.filter((job) => job.author === user?.id)
+      // Only the current user's postings, with applicant counts
+      const response = await jobAPI.getMyJobs()
+      const userJobs = response.results || response
       console.log("User jobs:", userJobs)
 
       // Transform the data to match the expected format
@@ -58,6 +54,8 @@ function DashboardContent({ user, onJobsUpdate }) {
         job_benefits: job.job_benefits || "",
         datePosted: job.created_at,
         status: "Active", // Default status
+        applicantTotal: job.applicant_total,
+        applicantCounts: job.applicant_counts,
         applicants: [], // Will be populated separately
       }))
 
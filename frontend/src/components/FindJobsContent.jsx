@@ -26,8 +26,11 @@ function FindJobsContent({ user }) {
       try {
         setLoading(true)
 
-        // Fetch all jobs
-        const jobsResponse = await jobAPI.getAllJobs()
+        // Fetch jobs, letting the server apply the type/setup filters
+        const jobsResponse = await jobAPI.getAllJobs({
+          job_type: jobTypeFilter === "All" ? "" : jobTypeFilter,
+          job_setup: setupFilter === "All" ? "" : setupFilter,
+        })
         console.log("Jobs API response:", jobsResponse)
 
         // Handle paginated response from Django
@@ -60,7 +63,7 @@ function FindJobsContent({ user }) {
     }
 
     fetchData()
-  }, [user])
+  }, [user, jobTypeFilter, setupFilter])
 
   // Handle job application
   const handleApplyForJob = async (jobId) => {